@@ -1,104 +1,144 @@
 """Compare performance of old vs new sync implementations."""
+import argparse
+import contextlib
+import io
+import json
+import tempfile
 import time
-import sqlite3
-from unittest.mock import patch, MagicMock
+import tracemalloc
+from pathlib import Path
+from unittest.mock import patch
 
+from taxa.batch import MAX_IDS_PER_REQUEST
 from taxa.config import Config
 from taxa.sync import sync_database
 
 
-def mock_old_implementation(config):
-    """Simulate old implementation behavior."""
-    start = time.time()
+def estimate_old_implementation(sim_taxa, rate):
+    """Estimate old implementation cost from its API call pattern.
 
-    # Simulate fetching 5000 global taxa
-    api_calls = 5000
+    The old sync fetched every global descendant and then made one
+    observation query per taxon. At these call counts the run time is
+    dominated by the client-side rate limit, so it is derived from the
+    rate rather than slept out.
 
-    # Simulate 2 API calls per taxon (taxa fetch + observation query)
-    api_calls *= 2
+    Args:
+        sim_taxa: Number of global descendant taxa to simulate
+        rate: Requests per second allowed by the rate limiter
 
-    # Simulate rate limiting (1 req/sec with pyinaturalist)
-    elapsed = api_calls  # Seconds at 1 req/sec
-
-    end = time.time()
+    Returns:
+        Dictionary with api_calls and estimated elapsed seconds
+    """
+    # 1 taxa fetch + 1 observation query per taxon
+    api_calls = sim_taxa * 2
 
     return {
         'api_calls': api_calls,
-        'elapsed_simulated': elapsed,
-        'taxa_count': 168  # Assume 168 actually have observations
+        'elapsed_estimated_s': api_calls / rate,
     }
 
 
-def test_new_implementation(config):
-    """Test new implementation with mocks."""
-    start = time.time()
-    api_calls = 0
+def measure_new_implementation(regional_taxa, rate):
+    """Run sync_database against mocked API calls and measure it.
 
-    with patch('taxa.sync.fetch_regional_taxa') as mock_regional, \
-         patch('taxa.sync.fetch_taxa_batch') as mock_batch:
+    API responses are mocked, so elapsed_s and peak_kb cover the local
+    work only (transforming taxa and writing the database). The rate-limited
+    API time is reported separately from the number of calls made.
 
-        # Simulate regional discovery (1 call)
-        mock_regional.return_value = [
-            {'id': i, 'descendant_obs_count': 10, 'direct_obs_count': 5}
-            for i in range(168)
-        ]
-        api_calls += 1
+    Args:
+        regional_taxa: Number of taxa returned by regional discovery
+        rate: Requests per second allowed by the rate limiter
 
-        # Simulate batch fetching (168 taxa / 30 batch = 6 calls)
-        def batch_side_effect(taxon_ids, batch_size=30, callback=None):
-            nonlocal api_calls
-            batches = (len(taxon_ids) + batch_size - 1) // batch_size
-            api_calls += batches
-            return [
-                {'id': tid, 'name': f'Taxon {tid}', 'rank': 'species', 'ancestors': []}
-                for tid in taxon_ids
-            ]
+    Returns:
+        Dictionary with api_calls, measured elapsed seconds, peak memory
+        and estimated API time
+    """
+    api_calls = 0
 
-        mock_batch.side_effect = batch_side_effect
+    def regional_side_effect(*args, **kwargs):
+        nonlocal api_calls
+        api_calls += 1
+        return [
+            {'id': i, 'descendant_obs_count': 10, 'direct_obs_count': 5}
+            for i in range(regional_taxa)
+        ]
 
-        sync_database(config)
+    def batch_side_effect(taxon_ids, batch_size=MAX_IDS_PER_REQUEST, callback=None):
+        nonlocal api_calls
+        batch_size = min(batch_size, MAX_IDS_PER_REQUEST)
+        api_calls += (len(taxon_ids) + batch_size - 1) // batch_size
+        return [
+            {'id': tid, 'name': f'Taxon {tid}', 'rank': 'species', 'ancestors': []}
+            for tid in taxon_ids
+        ]
 
-    end = time.time()
+    with tempfile.TemporaryDirectory() as tmpdir:
+        config = Config({
+            'database': str(Path(tmpdir) / 'flora.db'),
+            'regions': {'test': {'name': 'Test', 'place_ids': [123]}},
+            'taxa': {'test': {'name': 'Test', 'taxon_id': 456}},
+            'filters': {}
+        })
+
+        with patch('taxa.sync.fetch_regional_taxa', side_effect=regional_side_effect), \
+             patch('taxa.sync.fetch_taxa_batch', side_effect=batch_side_effect):
+
+            # Keep sync's progress output out of the report (and the JSON)
+            with contextlib.redirect_stdout(io.StringIO()):
+                tracemalloc.start()
+                start = time.perf_counter_ns()
+                sync_database(config)
+                elapsed_ns = time.perf_counter_ns() - start
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
 
     return {
         'api_calls': api_calls,
-        'elapsed_actual': end - start,
-        'taxa_count': 168
+        'elapsed_s': elapsed_ns / 1e9,
+        'peak_kb': peak / 1024,
+        'api_time_estimated_s': api_calls / rate,
     }
 
 
 def main():
     """Run comparison."""
-    config = Config({
-        'database': ':memory:',
-        'regions': {'test': {'name': 'Test', 'place_ids': [123]}},
-        'taxa': {'test': {'name': 'Test', 'taxon_id': 456}},
-        'filters': {}
-    })
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sim-taxa', type=int, default=5000,
+                        help='Global descendant taxa for the old implementation (default 5000)')
+    parser.add_argument('--regional-taxa', type=int, default=168,
+                        help='Taxa found by regional discovery for the new implementation (default 168)')
+    parser.add_argument('--rate', type=float, default=1.0,
+                        help='API requests per second allowed (default 1.0)')
+    parser.add_argument('--json', action='store_true',
+                        help='Print results as JSON')
+    args = parser.parse_args()
+
+    old_result = estimate_old_implementation(args.sim_taxa, args.rate)
+    new_result = measure_new_implementation(args.regional_taxa, args.rate)
+
+    if args.json:
+        print(json.dumps({'old': old_result, 'new': new_result}, indent=2))
+        return
 
     print("Performance Comparison: Old vs New Implementation")
     print("=" * 60)
     print()
 
-    print("OLD IMPLEMENTATION (simulated):")
-    old_result = mock_old_implementation(config)
+    print("OLD IMPLEMENTATION (estimated):")
     print(f"  API calls: {old_result['api_calls']:,}")
-    print(f"  Time (simulated): {old_result['elapsed_simulated']:,.1f} seconds")
-    print(f"  Taxa discovered: {old_result['taxa_count']}")
+    print(f"  API time at {args.rate:g} req/sec: {old_result['elapsed_estimated_s']:,.1f} seconds")
     print()
 
     print("NEW IMPLEMENTATION:")
-    new_result = test_new_implementation(config)
     print(f"  API calls: {new_result['api_calls']}")
-    print(f"  Time (actual): {new_result['elapsed_actual']:.2f} seconds")
-    print(f"  Taxa discovered: {new_result['taxa_count']}")
+    print(f"  API time at {args.rate:g} req/sec: {new_result['api_time_estimated_s']:,.1f} seconds")
+    print(f"  Local processing (measured): {new_result['elapsed_s'] * 1000:.1f} ms")
+    print(f"  Peak memory (measured): {new_result['peak_kb']:,.0f} KB")
     print()
 
     print("IMPROVEMENT:")
     api_reduction = (1 - new_result['api_calls'] / old_result['api_calls']) * 100
-    time_reduction = (1 - new_result['elapsed_actual'] / old_result['elapsed_simulated']) * 100
     print(f"  API calls reduced: {api_reduction:.1f}%")
-    print(f"  Time reduced: {time_reduction:.1f}%")
     print(f"  Speedup factor: {old_result['api_calls'] / new_result['api_calls']:.1f}x")
 
 
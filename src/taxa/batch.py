@@ -1,40 +1,78 @@
 """Batch fetching utilities for iNaturalist API."""
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import List, Dict, Any, Callable, Optional
 from pyinaturalist import get_taxa_by_id
 
+from taxa.limiter import AIMDLimiter
 from taxa.retry import with_retry
 
 
+# Most batch requests kept in flight at once. pyinaturalist's client-side
+# rate limiter still paces the actual requests, so this only hides round-trip
+# latency; it does not raise our request rate above iNat's recommendations.
+# An AIMDLimiter starts at one request and ramps up to this while the API
+# responds without 429s.
+MAX_WORKERS = 4
+
+# The /taxa/{id} endpoint returns at most 30 taxa per request; larger batches
+# would be silently truncated rather than saving requests.
+MAX_IDS_PER_REQUEST = 30
+
+
 def fetch_taxa_batch(
     taxon_ids: List[int],
-    batch_size: int = 30,
-    callback: Optional[Callable[[int, int], None]] = None
+    batch_size: int = MAX_IDS_PER_REQUEST,
+    callback: Optional[Callable[[int, int], None]] = None,
+    max_workers: int = MAX_WORKERS
 ) -> List[Dict[str, Any]]:
     """
     Fetch multiple taxa by ID in batches.
 
     Uses get_taxa_by_id with multiple IDs per call to reduce API requests.
     iNaturalist API supports fetching multiple taxa in a single request.
+    Batches are fetched concurrently, up to an adaptive limit that backs off
+    on rate limiting, but results are returned in the same order as the
+    batches were requested. Duplicate IDs are fetched once, so the result
+    holds one taxon per distinct ID.
 
     Args:
         taxon_ids: List of iNaturalist taxon IDs to fetch
-        batch_size: Number of taxa to fetch per API call (default 30)
+        batch_size: Number of taxa to fetch per API call (default and maximum 30)
         callback: Optional function called after each batch: callback(batch_num, total_batches)
+        max_workers: Maximum number of batch requests in flight (default 4)
 
     Returns:
         List of complete taxon dictionaries with full details and ancestors
     """
-    all_taxa = []
-    total_batches = (len(taxon_ids) + batch_size - 1) // batch_size  # Ceiling division
+    batch_size = min(batch_size, MAX_IDS_PER_REQUEST)
+    # A repeated ID would spend a slot in a 30-ID request for nothing
+    taxon_ids = list(dict.fromkeys(taxon_ids))
+    batches = [taxon_ids[i:i+batch_size] for i in range(0, len(taxon_ids), batch_size)]
+    total_batches = len(batches)
+
+    if not batches:
+        return []
+
+    results: List[Optional[List[Dict[str, Any]]]] = [None] * total_batches
+    workers = max(1, min(max_workers, total_batches))
+    limiter = AIMDLimiter(c_max=workers)
 
-    for batch_num, i in enumerate(range(0, len(taxon_ids), batch_size), start=1):
-        batch = taxon_ids[i:i+batch_size]
+    executor = ThreadPoolExecutor(max_workers=workers)
+    futures = {
+        executor.submit(with_retry, get_taxa_by_id, batch, limiter=limiter): index
+        for index, batch in enumerate(batches)
+    }
 
-        response = with_retry(get_taxa_by_id, batch)
-        taxa = response.get('results', [])
-        all_taxa.extend(taxa)
+    try:
+        for completed, future in enumerate(as_completed(futures), start=1):
+            response = future.result()
+            results[futures[future]] = response.get('results', [])
 
-        if callback:
-            callback(batch_num, total_batches)
+            if callback:
+                callback(completed, total_batches)
+    finally:
+        # On an error or Ctrl-C, drop the batches not yet started instead of
+        # sending them all before the exception propagates
+        executor.shutdown(wait=False, cancel_futures=True)
 
-    return all_taxa
+    return [taxon for batch_taxa in results for taxon in batch_taxa]
@@ -1,10 +1,32 @@
 """Breakdown query generation for hierarchical taxonomic queries."""
 import sqlite3
+from functools import lru_cache
 from taxa.taxonomy import TAXONOMIC_RANKS, sort_ranks, get_next_ranks
 
 
+@lru_cache(maxsize=8)
+def _rank_probe_sql(ranks):
+    """Build a UNION ALL query naming each rank column that matches a name.
+
+    Args:
+        ranks: Tuple of rank columns to probe
+
+    Returns:
+        str: SQL taking the taxon name once per rank
+    """
+    return " UNION ALL ".join(
+        f"SELECT '{rank}' WHERE EXISTS (SELECT 1 FROM taxa WHERE {rank} = ?)"
+        for rank in ranks
+    )
+
+
 def find_taxon_rank(db, taxon_name):
-    """Query each rank column to find where this taxon appears.
+    """Find which rank column this taxon appears in.
+
+    Probes every rank column with a single UNION ALL query, so the lookup
+    costs one round-trip regardless of how many ranks there are. Databases
+    created by `taxa sync` have every rank column; the schema is only
+    inspected when that query fails because some are missing.
 
     Args:
         db: SQLite database connection
@@ -17,23 +39,22 @@ def find_taxon_rank(db, taxon_name):
         ValueError: If taxon not found or found at multiple ranks
     """
     cursor = db.cursor()
-    found_ranks = []
-
-    # Get available columns in taxa table
-    cursor.execute("PRAGMA table_info(taxa)")
-    available_columns = {row[1] for row in cursor.fetchall()}
+    ranks = tuple(TAXONOMIC_RANKS)
 
-    for rank in TAXONOMIC_RANKS:
+    try:
+        cursor.execute(_rank_probe_sql(ranks), [taxon_name] * len(ranks))
+    except sqlite3.OperationalError:
         # Skip ranks not present in this database
-        if rank not in available_columns:
-            continue
+        cursor.execute("PRAGMA table_info(taxa)")
+        available_columns = {row[1] for row in cursor.fetchall()}
+        ranks = tuple(rank for rank in TAXONOMIC_RANKS if rank in available_columns)
 
-        result = cursor.execute(
-            f"SELECT 1 FROM taxa WHERE {rank} = ? LIMIT 1",
-            (taxon_name,)
-        )
-        if result.fetchone():
-            found_ranks.append(rank)
+        if not ranks:
+            raise ValueError(f"Taxon '{taxon_name}' not found in database")
+
+        cursor.execute(_rank_probe_sql(ranks), [taxon_name] * len(ranks))
+
+    found_ranks = [row[0] for row in cursor.fetchall()]
 
     if not found_ranks:
         raise ValueError(f"Taxon '{taxon_name}' not found in database")
@@ -47,11 +68,33 @@ def find_taxon_rank(db, taxon_name):
     return found_ranks[0]
 
 
+@lru_cache(maxsize=16)
+def _populated_rank_sql(base_rank, ranks):
+    """Build a CASE query naming the first rank populated below a base taxon.
+
+    CASE tests its WHEN clauses in order and stops at the first match, so
+    the ranks are probed in hierarchical order within one statement.
+
+    Args:
+        base_rank: Rank column holding the base taxon's name
+        ranks: Tuple of candidate rank columns, highest first
+
+    Returns:
+        str: SQL taking the base taxon once, as ?1
+    """
+    cases = " ".join(
+        f"WHEN EXISTS (SELECT 1 FROM taxa WHERE {base_rank} = ?1 AND {rank} IS NOT NULL) "
+        f"THEN '{rank}'"
+        for rank in ranks
+    )
+    return f"SELECT CASE {cases} END"
+
+
 def find_first_populated_rank(conn, base_taxon, base_rank):
     """Find the first populated rank below base_rank for the given taxon.
 
     Checks each rank in hierarchical order to find the first one with
-    non-NULL values among descendants of base_taxon.
+    non-NULL values among descendants of base_taxon, in a single query.
 
     Args:
         conn: SQLite database connection
@@ -66,8 +109,6 @@ def find_first_populated_rank(conn, base_taxon, base_rank):
     Raises:
         ValueError: If no populated ranks found below base_rank
     """
-    cursor = conn.cursor()
-
     # Get all ranks below base_rank
     remaining_ranks = get_next_ranks(base_rank, count=100)
 
@@ -76,20 +117,22 @@ def find_first_populated_rank(conn, base_taxon, base_rank):
 
     expected_rank = remaining_ranks[0]
 
-    # Check each rank for non-NULL values
-    for candidate_rank in remaining_ranks:
-        result = cursor.execute(
-            f"SELECT 1 FROM taxa WHERE {base_rank} = ? AND {candidate_rank} IS NOT NULL LIMIT 1",
-            (base_taxon,)
-        )
-        if result.fetchone():
-            return (candidate_rank, expected_rank)
+    populated_rank = conn.execute(
+        _populated_rank_sql(base_rank, tuple(remaining_ranks)), (base_taxon,)
+    ).fetchone()[0]
+
+    if populated_rank is None:
+        raise ValueError(f"No populated levels below '{base_rank}' in taxonomy")
 
-    raise ValueError(f"No populated levels below '{base_rank}' in taxonomy")
+    return (populated_rank, expected_rank)
 
 
 def generate_breakdown_query(base_taxon, base_rank, levels, region_key=None):
-    """Generate UNION query for hierarchical breakdown.
+    """Generate rollup query for hierarchical breakdown.
+
+    The taxa/observations join and base filters run once in a CTE; each
+    level then aggregates that CTE, and the per-level results are combined
+    with UNION ALL (SQLite has no GROUPING SETS).
 
     Args:
         base_taxon: Name of taxon to break down (e.g., "Asteraceae")
@@ -101,7 +144,54 @@ def generate_breakdown_query(base_taxon, base_rank, levels, region_key=None):
         Tuple of (query_string, params_list)
     """
     # Sort levels to ensure hierarchical order
-    levels = sort_ranks(levels)
+    levels = tuple(sort_ranks(levels))
+
+    params = [base_taxon]
+    if region_key:
+        params.append(region_key)
+
+    return build_breakdown_sql(base_rank, levels, bool(region_key)), params
+
+
+@lru_cache(maxsize=64)
+def build_breakdown_sql(base_rank, levels, filter_region):
+    """Build the breakdown SQL for one query shape.
+
+    Only the shape (base rank, levels, whether a region filter applies)
+    affects the SQL text; taxon and region values are bound as parameters.
+    Results are cached, so repeated breakdowns return the identical string
+    and hit sqlite3's per-connection statement cache as well.
+
+    Args:
+        base_rank: Rank of base taxon (e.g., "family")
+        levels: Tuple of ranks in hierarchical order
+        filter_region: Whether to add an observations.region_key filter
+
+    Returns:
+        str: SQL with one placeholder for the taxon, plus one for the region
+    """
+    # Build WHERE clause for the shared join
+    where_parts = [f"{base_rank} = ?"]
+
+    # Add region filter if specified
+    if filter_region:
+        where_parts.append("observations.region_key = ?")
+
+    # Multi-level breakdowns drop rows missing any grouped level. Every level
+    # groups by the first one, so that filter can shrink the shared CTE.
+    if len(levels) > 1:
+        where_parts.append(f"{levels[0]} IS NOT NULL")
+
+    base_query = f"""
+        WITH base AS (
+            SELECT {', '.join(levels)},
+                observations.observation_count AS observation_count,
+                CASE WHEN taxa.rank = 'species' THEN taxa.id END AS species_id
+            FROM taxa
+            JOIN observations ON observations.taxon_id = taxa.id
+            WHERE {' AND '.join(where_parts)}
+        )
+        """
 
     queries = []
 
@@ -120,44 +210,30 @@ def generate_breakdown_query(base_taxon, base_rank, levels, region_key=None):
 
         # Add aggregation columns
         select_cols.extend([
-            "SUM(observations.observation_count) as observation_count",
-            "COUNT(DISTINCT CASE WHEN taxa.rank = 'species' THEN taxa.id END) as species_count"
+            "SUM(observation_count) as observation_count",
+            "COUNT(DISTINCT species_id) as species_count"
         ])
 
-        # Build WHERE clause
-        where_parts = [f"{base_rank} = ?"]
-        params = [base_taxon]
+        # Add NOT NULL checks for the deeper levels we're grouping by (the
+        # first level is filtered in the CTE). Single-level breakdowns keep
+        # NULL values so they can be grouped.
+        where_clause = ""
+        if len(group_cols) > 1:
+            where_clause = "WHERE " + " AND ".join(f"{col} IS NOT NULL" for col in group_cols[1:])
 
-        # Add NOT NULL checks for all levels we're grouping by
-        # Skip this for single-level breakdowns to allow grouping of NULL values
-        if len(levels) > 1:
-            for col in group_cols:
-                where_parts.append(f"{col} IS NOT NULL")
-
-        # Add region filter if specified
-        if region_key:
-            where_parts.append("observations.region_key = ?")
-            params.append(region_key)
-
-        query = f"""
+        queries.append(f"""
         SELECT {', '.join(select_cols)}
-        FROM taxa
-        JOIN observations ON observations.taxon_id = taxa.id
-        WHERE {' AND '.join(where_parts)}
+        FROM base
+        {where_clause}
         GROUP BY {', '.join(group_cols)}
-        """
-
-        queries.append((query, params))
+        """)
 
     # Combine with UNION ALL
-    full_query = " UNION ALL ".join(q for q, _ in queries)
+    full_query = base_query + " UNION ALL ".join(queries)
 
     # Add ORDER BY (NULLs first for subtotals, then by observation count)
     order_cols = [f"{level} NULLS FIRST" for level in levels]
     order_cols.append("observation_count DESC")
     full_query += f" ORDER BY {', '.join(order_cols)}"
 
-    # Flatten params
-    all_params = [p for _, params in queries for p in params]
-
-    return full_query, all_params
+    return full_query
@@ -3,18 +3,37 @@ import click
 import subprocess
 import sqlite3
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
 from pathlib import Path
-import pyinaturalist
-from taxa.config import Config, ConfigError
-from taxa.sync import sync_database
 from taxa.breakdown import find_taxon_rank, generate_breakdown_query, find_first_populated_rank
 from taxa.taxonomy import get_next_ranks, validate_rank_sequence
+from taxa.db import connect
 from taxa.completion import generate_completion_cache, write_completion_cache, get_cache_path
 from taxa.formatting import output_results
-from pyinaturalist import get_places_autocomplete, get_taxa_autocomplete
+from taxa.stats import compute_stats, store_stats, read_sync_info, cached_stats
 
-# Set user agent to comply with iNaturalist API best practices
-pyinaturalist.user_agent = "taxa-flora-query-tool/1.0 (github.com/mml/taxa)"
+# User agent sent to the iNaturalist API, per its best practices
+USER_AGENT = "taxa-flora-query-tool/1.0 (github.com/mml/taxa)"
+
+# Autocomplete lookups kept in flight at once by `taxa search`. Small on
+# purpose: pyinaturalist's rate limiter paces the requests themselves.
+SEARCH_WORKERS = 3
+
+# One result line per place/taxon in `taxa search` output
+PLACE_LINE = "  %8d - %s"
+TAXON_LINE = "  %8d - %s%s [%s]"
+
+# Statements `taxa query --limit/--offset` can wrap as a subquery
+READ_QUERY_PREFIXES = ('SELECT', 'WITH', 'VALUES')
+
+# Appended for --limit/--offset; SQLite treats LIMIT -1 as no limit
+LIMIT_CLAUSE = "LIMIT ? OFFSET ?"
+
+
+def limit_params(limit, offset):
+    """Bind values for LIMIT_CLAUSE, treating missing options as unbounded."""
+    return [-1 if limit is None else limit, offset or 0]
 
 
 @click.group()
@@ -29,6 +48,12 @@ def main():
 @click.option('--dry-run', is_flag=True, help='Estimate only, do not fetch/store')
 def sync(config, timeout, dry_run):
     """Sync data from iNaturalist API to database."""
+    # Imported here so other commands don't pay for yaml and the sync stack
+    from taxa.config import Config, ConfigError
+    from taxa.sync import sync_database
+
+    inaturalist_api()
+
     try:
         cfg = Config.from_file(Path(config))
         sync_database(cfg, dry_run=dry_run)
@@ -50,25 +75,37 @@ def sync(config, timeout, dry_run):
     help='Output format (default: auto-detect)'
 )
 @click.option('--show-null', is_flag=True, help='Show NULL instead of empty strings')
-def query(query, database, format, show_null):
+@click.option('--limit', type=click.IntRange(min=0), help='Return at most this many rows (SELECT only)')
+@click.option('--offset', type=click.IntRange(min=0), help='Skip this many rows first (SELECT only)')
+def query(query, database, format, show_null, limit, offset):
     """Run SQL query against database or open interactive shell."""
     if not Path(database).exists():
         click.echo(f"ERROR: Database not found: {database}", err=True)
         click.echo("Run 'taxa sync' first to create the database")
         sys.exit(1)
 
+    params = []
+    if query and (limit is not None or offset is not None):
+        if not query.lstrip().upper().startswith(READ_QUERY_PREFIXES):
+            click.echo("ERROR: --limit and --offset only apply to SELECT queries", err=True)
+            sys.exit(1)
+
+        # Let SQLite stop after the requested page instead of running the full query
+        # (newlines keep a trailing -- comment from swallowing the wrapper)
+        query = f"SELECT * FROM (\n{query.strip().rstrip(';')}\n) {LIMIT_CLAUSE}"
+        params = limit_params(limit, offset)
+
     if query:
         # Run single query
-        conn = sqlite3.connect(database)
+        conn = connect(database)
         cursor = conn.cursor()
         try:
-            cursor.execute(query)
-            results = cursor.fetchall()
+            cursor.execute(query, params)
 
-            # Format and output results
+            # Format and output results, streaming rows from the cursor
             if cursor.description:
                 headers = [desc[0] for desc in cursor.description]
-                output_results(headers, results, format=format, show_null=show_null)
+                output_results(headers, cursor, format=format, show_null=show_null)
 
         except sqlite3.Error as e:
             click.echo(f"ERROR: {e}", err=True)
@@ -80,48 +117,105 @@ def query(query, database, format, show_null):
         subprocess.run(['sqlite3', database])
 
 
+def inaturalist_api():
+    """Import pyinaturalist and set our user agent.
+
+    Called only by the commands that talk to the API, so the rest of the CLI
+    starts without importing pyinaturalist and its model stack.
+
+    Returns:
+        The pyinaturalist module
+    """
+    import pyinaturalist
+    pyinaturalist.user_agent = USER_AGENT
+    return pyinaturalist
+
+
 @main.group()
 def search():
     """Search for iNaturalist IDs."""
     pass
 
 
+def autocomplete_all(lookup, queries):
+    """Run an autocomplete lookup for each distinct query concurrently.
+
+    Queries differing only in case or surrounding whitespace are looked up once.
+    Every worker shares the calling thread's session, so the lookups reuse one
+    connection pool instead of opening a session (and TLS handshake) per thread.
+
+    Args:
+        lookup: pyinaturalist autocomplete function (places or taxa)
+        queries: Search strings, in the order to report them
+
+    Returns:
+        List of (query, results) tuples in first-seen order
+    """
+    # Lists pasted from a config often repeat a name with different case or
+    # stray spaces; normalizing the key keeps those to one API request
+    unique = {}
+    for query in queries:
+        unique.setdefault(query.strip().lower(), query)
+
+    from pyinaturalist.session import get_local_session
+
+    session = get_local_session()
+
+    with ThreadPoolExecutor(max_workers=min(SEARCH_WORKERS, len(unique))) as executor:
+        futures = [
+            (query, executor.submit(lookup, q=query, per_page=10, session=session))
+            for query in unique.values()
+        ]
+        return [(query, future.result().get('results', [])) for query, future in futures]
+
+
 @search.command()
-@click.argument('query')
-def places(query):
+@click.argument('queries', nargs=-1, required=True)
+def places(queries):
     """Search for place IDs."""
     try:
-        response = get_places_autocomplete(q=query, per_page=10)
-        results = response.get('results', [])
-
-        if not results:
-            click.echo(f"No places found for: {query}")
-            return
-
-        click.echo(f"Places matching '{query}':\n")
-        for place in results:
-            click.echo(f"  {place['id']:8d} - {place['display_name']}")
+        lookup = inaturalist_api().get_places_autocomplete
+        for index, (query, results) in enumerate(autocomplete_all(lookup, queries)):
+            if index:
+                click.echo()
+
+            if not results:
+                click.echo(f"No places found for: {query}")
+                continue
+
+            click.echo(f"Places matching '{query}':\n")
+            click.echo("\n".join(
+                PLACE_LINE % (place['id'], place['display_name']) for place in results
+            ))
     except Exception as e:
         click.echo(f"ERROR: {e}", err=True)
         sys.exit(1)
 
 
 @search.command()
-@click.argument('query')
-def taxa(query):
+@click.argument('queries', nargs=-1, required=True)
+def taxa(queries):
     """Search for taxon IDs."""
     try:
-        response = get_taxa_autocomplete(q=query, per_page=10)
-        results = response.get('results', [])
-
-        if not results:
-            click.echo(f"No taxa found for: {query}")
-            return
-
-        click.echo(f"Taxa matching '{query}':\n")
-        for taxon in results:
-            common = f" ({taxon.get('preferred_common_name', '')})" if taxon.get('preferred_common_name') else ""
-            click.echo(f"  {taxon['id']:8d} - {taxon['name']}{common} [{taxon['rank']}]")
+        lookup = inaturalist_api().get_taxa_autocomplete
+        for index, (query, results) in enumerate(autocomplete_all(lookup, queries)):
+            if index:
+                click.echo()
+
+            if not results:
+                click.echo(f"No taxa found for: {query}")
+                continue
+
+            click.echo(f"Taxa matching '{query}':\n")
+            click.echo("\n".join(
+                TAXON_LINE % (
+                    taxon['id'],
+                    taxon['name'],
+                    f" ({taxon['preferred_common_name']})" if taxon.get('preferred_common_name') else "",
+                    taxon['rank'],
+                )
+                for taxon in results
+            ))
     except Exception as e:
         click.echo(f"ERROR: {e}", err=True)
         sys.exit(1)
@@ -129,42 +223,36 @@ def taxa(query):
 
 @main.command()
 @click.option('--database', '-d', default='flora.db', help='Database file path')
-def info(database):
+@click.option('--refresh', is_flag=True, help='Recount taxa and observations and update the cached counts')
+def info(database, refresh):
     """Show database info and stats."""
     if not Path(database).exists():
         click.echo(f"ERROR: Database not found: {database}", err=True)
         sys.exit(1)
 
-    conn = sqlite3.connect(database)
-    cursor = conn.cursor()
+    conn = connect(database, readonly=not refresh)
 
     try:
-        # Get sync info
-        cursor.execute("SELECT value FROM sync_info WHERE key = 'last_sync'")
-        row = cursor.fetchone()
-        last_sync = row[0] if row else "Never"
-
-        # Get counts
-        cursor.execute("SELECT COUNT(*) FROM taxa")
-        taxa_count = cursor.fetchone()[0]
-
-        cursor.execute("SELECT COUNT(DISTINCT region_key) FROM observations")
-        region_count = cursor.fetchone()[0]
-
-        cursor.execute("SELECT COUNT(*) FROM observations")
-        obs_count = cursor.fetchone()[0]
-
-        cursor.execute("SELECT SUM(observation_count) FROM observations")
-        total_obs = cursor.fetchone()[0] or 0
+        # Sync metadata, including counts cached at the end of sync
+        sync_info = read_sync_info(conn)
+        last_sync = sync_info.get('last_sync', "Never")
+
+        stats = None if refresh else cached_stats(sync_info)
+        if stats is None:
+            # Older database or explicit refresh: count from the tables
+            stats = compute_stats(conn)
+            if refresh:
+                store_stats(conn, stats)
+                conn.commit()
 
         # Display info
         click.echo(f"Database: {database}")
         click.echo(f"Last sync: {last_sync}")
         click.echo()
-        click.echo(f"Taxa: {taxa_count:,}")
-        click.echo(f"Regions: {region_count}")
-        click.echo(f"Region-taxon combinations: {obs_count:,}")
-        click.echo(f"Total observations: {total_obs:,}")
+        click.echo(f"Taxa: {stats['taxa_count']:,}")
+        click.echo(f"Regions: {stats['region_count']}")
+        click.echo(f"Region-taxon combinations: {stats['obs_rows']:,}")
+        click.echo(f"Total observations: {stats['total_observation_count']:,}")
 
     except sqlite3.Error as e:
         click.echo(f"ERROR: Database error: {e}", err=True)
@@ -185,7 +273,9 @@ def info(database):
     help='Output format (default: auto-detect)'
 )
 @click.option('--show-null', is_flag=True, help='Show NULL instead of empty strings')
-def breakdown(taxon_name, levels, region, database, format, show_null):
+@click.option('--limit', type=click.IntRange(min=0), help='Show at most this many rows')
+@click.option('--offset', type=click.IntRange(min=0), help='Skip this many rows first')
+def breakdown(taxon_name, levels, region, database, format, show_null, limit, offset):
     """Break down a taxon into hierarchical levels with observation counts."""
     if not Path(database).exists():
         click.echo(f"ERROR: Database not found: {database}", err=True)
@@ -193,7 +283,7 @@ def breakdown(taxon_name, levels, region, database, format, show_null):
         sys.exit(1)
 
     try:
-        conn = sqlite3.connect(database)
+        conn = connect(database, readonly=True)
 
         # Auto-detect taxon rank
         base_rank = find_taxon_rank(conn, taxon_name)
@@ -229,18 +319,28 @@ def breakdown(taxon_name, levels, region, database, format, show_null):
             region_key=region
         )
 
+        if limit is not None or offset is not None:
+            query = f"{query} {LIMIT_CLAUSE}"
+            params = params + limit_params(limit, offset)
+
         cursor = conn.cursor()
         cursor.execute(query, params)
-        results = cursor.fetchall()
-
-        if not results:
-            click.echo(f"No observations found for {taxon_name}" +
-                      (f" in region '{region}'" if region else ""))
+        first_row = cursor.fetchone()
+
+        if first_row is None:
+            if limit is not None or offset is not None:
+                # The breakdown may have rows; this page just holds none
+                click.echo(f"No rows in the requested page for {taxon_name}" +
+                          (f" in region '{region}'" if region else "") +
+                          f" (offset {offset or 0})")
+            else:
+                click.echo(f"No observations found for {taxon_name}" +
+                          (f" in region '{region}'" if region else ""))
             sys.exit(0)
 
-        # Format and output results
+        # Format and output results, streaming the rest from the cursor
         headers = [desc[0] for desc in cursor.description]
-        output_results(headers, results, format=format, show_null=show_null)
+        output_results(headers, chain([first_row], cursor), format=format, show_null=show_null)
 
     except ValueError as e:
         click.echo(f"ERROR: {e}", err=True)
@@ -1,13 +1,40 @@
 """Shell completion support for taxa CLI."""
 import json
-import sqlite3
 import os
-import fcntl
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
+from functools import lru_cache
 from pathlib import Path
+from typing import Optional
+from taxa.db import connect
 from taxa.taxonomy import TAXONOMIC_RANKS
 
 
+# Completion queries, kept as fixed strings so sqlite3's statement cache can reuse them
+TAXON_NAMES_SQL = "SELECT DISTINCT scientific_name FROM taxa ORDER BY scientific_name"
+REGION_KEYS_SQL = "SELECT DISTINCT region_key FROM observations ORDER BY region_key"
+
+
+def _column_values(database_path: Path, sql: str) -> list:
+    """Run a single-column query on its own read-only connection.
+
+    Args:
+        database_path: Path to flora.db
+        sql: Query selecting one column
+
+    Returns:
+        List of the column's values
+    """
+    conn = connect(database_path, readonly=True)
+    try:
+        # Unpack rows straight off the cursor rather than materializing them
+        # with fetchall() first
+        return [value for (value,) in conn.execute(sql)]
+    finally:
+        conn.close()
+
+
 def generate_completion_cache(database_path: Path) -> dict:
     """Generate completion data from database.
 
@@ -25,22 +52,18 @@ def generate_completion_cache(database_path: Path) -> dict:
     if not database_path.exists():
         raise FileNotFoundError(f"Database not found: {database_path}")
 
-    conn = sqlite3.connect(database_path)
-    cursor = conn.cursor()
-
-    # Get unique taxon names
-    cursor.execute("SELECT DISTINCT scientific_name FROM taxa ORDER BY scientific_name")
-    taxon_names = [row[0] for row in cursor.fetchall()]
-
-    # Get unique region keys
-    cursor.execute("SELECT DISTINCT region_key FROM observations ORDER BY region_key")
-    region_keys = [row[0] for row in cursor.fetchall()]
+    # Get unique taxon names and region keys. Each query scans a different
+    # table on its own connection, and sqlite3 releases the GIL while a
+    # statement runs, so the two scans overlap.
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        taxa_future = executor.submit(_column_values, database_path, TAXON_NAMES_SQL)
+        regions_future = executor.submit(_column_values, database_path, REGION_KEYS_SQL)
+        taxon_names = taxa_future.result()
+        region_keys = regions_future.result()
 
     # Get database stats
     db_stat = database_path.stat()
 
-    conn.close()
-
     return {
         "metadata": {
             "generated_at": datetime.now(timezone.utc).isoformat(),
@@ -56,7 +79,11 @@ def generate_completion_cache(database_path: Path) -> dict:
 
 
 def write_completion_cache(cache_data: dict, cache_path: Path):
-    """Write cache to file with atomic write and flock protection.
+    """Write cache to file atomically.
+
+    Each writer gets its own temp file and renames it into place, so
+    concurrent regenerations never see or clobber each other's partial
+    output; the last rename wins.
 
     Args:
         cache_data: Dictionary with completion data
@@ -65,17 +92,24 @@ def write_completion_cache(cache_data: dict, cache_path: Path):
     cache_path = Path(cache_path)
     cache_path.parent.mkdir(parents=True, exist_ok=True)
 
-    # Write to temp file with exclusive lock
-    temp_path = cache_path.with_suffix('.tmp')
+    # Write to a uniquely named temp file (mkstemp opens with O_EXCL)
+    fd, temp_path = tempfile.mkstemp(dir=cache_path.parent, prefix='.cache-', suffix='.tmp')
+
+    try:
+        # mkstemp creates the file 0600; give it the mode open() would have
+        umask = os.umask(0)
+        os.umask(umask)
+        os.fchmod(fd, 0o666 & ~umask)
 
-    with open(temp_path, 'w') as f:
-        # Acquire exclusive lock (blocks if another process has it)
-        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
-        json.dump(cache_data, f, indent=2)
-        # Lock released on close
+        with os.fdopen(fd, 'w') as f:
+            # Compact separators: the cache is machine-read, and indenting doubles its size
+            json.dump(cache_data, f, separators=(',', ':'))
 
-    # Atomic rename
-    temp_path.rename(cache_path)
+        # Atomic rename
+        os.replace(temp_path, cache_path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
 
 
 def get_cache_path(database_name: str) -> Path:
@@ -87,11 +121,17 @@ def get_cache_path(database_name: str) -> Path:
     Returns:
         Path to cache file in XDG cache directory
     """
+    # The environment is part of the cache key, so changes are still honored
+    return _cache_path(database_name, os.environ.get('XDG_CACHE_HOME'), os.environ.get('HOME'))
+
+
+@lru_cache(maxsize=32)
+def _cache_path(database_name: str, cache_home: Optional[str], home: Optional[str]) -> Path:
+    """Resolve the cache file path; memoized by get_cache_path's arguments."""
     # Extract basename without extension
     db_base = Path(database_name).stem
 
     # Respect XDG_CACHE_HOME or use ~/.cache
-    cache_home = os.environ.get('XDG_CACHE_HOME')
     if cache_home:
         cache_dir = Path(cache_home)
     else:
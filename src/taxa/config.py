@@ -3,6 +3,12 @@ import yaml
 from pathlib import Path
 from typing import Dict, Any
 
+# Use libyaml's C loader when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
 
 class ConfigError(Exception):
     """Raised when config file is invalid."""
@@ -72,7 +78,7 @@ class Config:
         """Load and parse config from YAML file."""
         try:
             with open(path, 'r') as f:
-                data = yaml.safe_load(f)
+                data = yaml.load(f, Loader=SafeLoader)
         except yaml.YAMLError as e:
             raise ConfigError(f"Invalid YAML: {e}")
         except FileNotFoundError:
@@ -0,0 +1,37 @@
+"""SQLite connections for the taxa database."""
+import sqlite3
+from pathlib import Path
+from typing import Union
+
+
+# Per-connection tuning applied to every connection, including sync's. None of these
+# change the database file itself (unlike journal_mode=WAL), so they are
+# safe on databases that sync later replaces by rename.
+CONNECTION_PRAGMAS = (
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA mmap_size = 268435456",  # 256 MiB
+    "PRAGMA cache_size = -65536",    # 64 MiB
+)
+
+
+def connect(database: Union[str, Path], readonly: bool = False) -> sqlite3.Connection:
+    """
+    Open the taxa database with tuned per-connection pragmas.
+
+    Args:
+        database: Path to the database file
+        readonly: Open with mode=ro, so SQLite never takes a write lock and
+            a missing file is an error instead of being created
+
+    Returns:
+        SQLite database connection
+    """
+    if readonly:
+        conn = sqlite3.connect(f"{Path(database).resolve().as_uri()}?mode=ro", uri=True)
+    else:
+        conn = sqlite3.connect(database)
+
+    for pragma in CONNECTION_PRAGMAS:
+        conn.execute(pragma)
+
+    return conn
@@ -35,6 +35,9 @@ def fetch_taxon_descendants(
     while True:
         page = 1
         batch_count = 0
+        # Highest ID yielded so far, tracked as we go rather than rescanned
+        # (taxon IDs are positive, so 0 means none yet)
+        max_id = 0
 
         # Fetch up to 10k results in this batch
         while batch_count < MAX_RESULTS_PER_SEARCH:
@@ -63,6 +66,9 @@ def fetch_taxon_descendants(
                 total_fetched += 1
                 batch_count += 1
 
+                current_id = taxon['id']
+                max_id = current_id if current_id > max_id else max_id
+
                 if max_results and total_fetched >= max_results:
                     return
 
@@ -86,11 +92,10 @@ def fetch_taxon_descendants(
                 break
 
         # Note: Assumes API returns results in ascending ID order, allowing us to use
-        # the max ID from the final page as the starting point for the next batch
-        if results:
-            id_above = max(taxon['id'] for taxon in results)
-        else:
+        # the max ID seen as the starting point for the next batch
+        if not max_id:
             break
+        id_above = max_id
 
 
 def fetch_regional_taxa(
@@ -30,12 +30,38 @@ def transform_null(value, show_null=False):
     return value
 
 
+def make_row_transformer(show_null=False, stringify=False):
+    """Build a function applying NULL transformation to a whole row.
+
+    The NULL placeholder is resolved once here, so the returned function
+    does only one None check per cell.
+
+    Args:
+        show_null: If True, render None as 'NULL'; if False, render as ''
+        stringify: If True, also convert non-None values to str
+
+    Returns:
+        Function taking a row and returning a list of transformed values
+    """
+    null = 'NULL' if show_null else ''
+
+    if stringify:
+        def transform_row(row):
+            return [null if val is None else str(val) for val in row]
+    else:
+        def transform_row(row):
+            return [null if val is None else val for val in row]
+
+    return transform_row
+
+
 def format_csv(headers, rows, show_null=False):
     """Format results as CSV output to stdout.
 
     Args:
         headers: List of column header strings
-        rows: List of tuples containing row data
+        rows: Iterable of tuples containing row data; consumed lazily, so a
+            cursor streams straight to stdout
         show_null: If True, render None as 'NULL'; if False, render as ''
     """
     writer = csv.writer(
@@ -46,9 +72,11 @@ def format_csv(headers, rows, show_null=False):
     )
 
     writer.writerow(headers)
-    for row in rows:
-        transformed_row = [transform_null(val, show_null) for val in row]
-        writer.writerow(transformed_row)
+    if show_null:
+        writer.writerows(map(make_row_transformer(show_null), rows))
+    else:
+        # csv writes None as an empty field, so rows need no transformation
+        writer.writerows(rows)
 
 
 def format_table(headers, rows, show_null=False):
@@ -56,7 +84,7 @@ def format_table(headers, rows, show_null=False):
 
     Args:
         headers: List of column header strings
-        rows: List of tuples containing row data
+        rows: Iterable of tuples containing row data
         show_null: If True, render None as 'NULL'; if False, render as ''
     """
     table = Table(
@@ -75,9 +103,9 @@ def format_table(headers, rows, show_null=False):
             table.add_column(header)
 
     # Add rows with NULL transformation
+    transform_row = make_row_transformer(show_null, stringify=True)
     for row in rows:
-        transformed_row = [str(transform_null(val, show_null)) for val in row]
-        table.add_row(*transformed_row)
+        table.add_row(*transform_row(row))
 
     console = Console()
     console.print(table)
@@ -88,7 +116,7 @@ def output_results(headers, rows, format='auto', show_null=False):
 
     Args:
         headers: List of column header strings
-        rows: List of tuples containing row data
+        rows: Iterable of tuples containing row data (a list or a cursor)
         format: Output format - 'auto', 'table', 'csv', or 'tree' (future)
         show_null: If True, render None as 'NULL'; if False, render as ''
 
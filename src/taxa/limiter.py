@@ -0,0 +1,85 @@
+"""Adaptive concurrency limit for parallel API requests."""
+import threading
+from collections import deque
+
+
+class AIMDLimiter:
+    """Caps requests in flight, adapting the cap to how the API responds.
+
+    Additive increase, multiplicative decrease: each healthy response raises
+    the limit by alpha, and each failure (rate limit, network error) or slow
+    window multiplies it by beta. The limit converges on what the API can
+    serve without 429s. pyinaturalist's rate limiter still paces the
+    requests themselves; this only decides how many may wait on it at once.
+    """
+
+    def __init__(
+        self,
+        initial: float = 1.0,
+        c_min: float = 1.0,
+        c_max: float = 4.0,
+        alpha: float = 0.5,
+        beta: float = 0.5,
+        target_latency: float = 5.0,
+        window: int = 20
+    ):
+        """Initialize the limiter.
+
+        Args:
+            initial: Starting concurrency limit (default: 1)
+            c_min: Lowest limit a failure can drop to (default: 1)
+            c_max: Highest limit successes can raise it to (default: 4)
+            alpha: Amount added to the limit per healthy response (default: 0.5)
+            beta: Factor the limit is multiplied by on failure (default: 0.5)
+            target_latency: Mean latency in seconds above which responses
+                count as unhealthy (default: 5.0)
+            window: Number of recent latencies averaged (default: 20)
+
+        Raises:
+            ValueError: If the limits or factors are out of range
+        """
+        if not 1 <= c_min <= initial <= c_max:
+            raise ValueError(f"need 1 <= c_min <= initial <= c_max, got {c_min}, {initial}, {c_max}")
+        if alpha <= 0 or not 0 < beta < 1:
+            raise ValueError(f"need alpha > 0 and 0 < beta < 1, got {alpha}, {beta}")
+
+        self.c = float(initial)
+        self.c_min = c_min
+        self.c_max = c_max
+        self.alpha = alpha
+        self.beta = beta
+        self.target_latency = target_latency
+        self.in_flight = 0
+        self._latencies = deque(maxlen=window)
+        self._condition = threading.Condition()
+
+    @property
+    def limit(self) -> int:
+        """Number of requests currently allowed in flight."""
+        return int(self.c)
+
+    def acquire(self) -> None:
+        """Block until a request may start, then count it as in flight."""
+        with self._condition:
+            while self.in_flight >= int(self.c):
+                self._condition.wait()
+            self.in_flight += 1
+
+    def release(self, success: bool, latency: float) -> None:
+        """Record a finished request and adjust the limit.
+
+        Args:
+            success: False if the request hit a rate limit or network error
+            latency: Seconds the request took
+        """
+        with self._condition:
+            self.in_flight -= 1
+            self._latencies.append(latency)
+            mean_latency = sum(self._latencies) / len(self._latencies)
+
+            if success and mean_latency <= self.target_latency:
+                self.c = min(self.c_max, self.c + self.alpha)
+            else:
+                self.c = max(self.c_min, self.c * self.beta)
+
+            self._condition.notify_all()
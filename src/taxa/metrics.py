@@ -4,6 +4,8 @@ import time
 class MetricsTracker:
     """Tracks metrics for progress monitoring during API data fetching."""
 
+    __slots__ = ('total_items', 'processed', 'api_calls', 'start_time')
+
     def __init__(self, total_items: int):
         """Initialize the metrics tracker.
 
@@ -13,7 +15,8 @@ class MetricsTracker:
         self.total_items = total_items
         self.processed = 0
         self.api_calls = 0
-        self.start_time = time.time()
+        # Monotonic, so wall-clock adjustments can't skew rates mid-sync
+        self.start_time = time.monotonic()
 
     def increment_processed(self, count: int = 1) -> None:
         """Increment the processed items counter.
@@ -47,10 +50,7 @@ class MetricsTracker:
         Returns:
             Items processed per second
         """
-        elapsed_time = time.time() - self.start_time
-        if elapsed_time == 0:
-            return 0.0
-        return self.processed / elapsed_time
+        return self._rate(time.monotonic() - self.start_time)
 
     def estimate_completion_time(self) -> float:
         """Estimate remaining time to completion in seconds.
@@ -58,7 +58,16 @@ class MetricsTracker:
         Returns:
             Estimated seconds remaining to process all items
         """
-        rate = self.get_processing_rate()
+        return self._eta(self.get_processing_rate())
+
+    def _rate(self, elapsed_time: float) -> float:
+        """Items per second over elapsed_time seconds."""
+        if elapsed_time == 0:
+            return 0.0
+        return self.processed / elapsed_time
+
+    def _eta(self, rate: float) -> float:
+        """Seconds left to process the remaining items at rate."""
         if rate == 0:
             return 0.0
         remaining_items = self.total_items - self.processed
@@ -80,9 +89,10 @@ class MetricsTracker:
         Returns:
             Formatted string with progress metrics
         """
-        elapsed = time.time() - self.start_time
-        rate = self.get_processing_rate()
-        estimate = self.estimate_completion_time()
+        # Read the clock once so elapsed, rate and estimate agree
+        elapsed = time.monotonic() - self.start_time
+        rate = self._rate(elapsed)
+        estimate = self._eta(rate)
         progress = self.get_progress_percent()
 
         return (
@@ -1,31 +1,77 @@
 """Retry wrapper with exponential backoff for API calls."""
+import random
 import time
 import logging
-from typing import Callable, Any, TypeVar
+from email.utils import parsedate_to_datetime
+from typing import Callable, Any, Optional, TypeVar
 from functools import wraps
 
+from requests.exceptions import ConnectionError as RequestsConnectionError, Timeout
+
+from taxa.limiter import AIMDLimiter
+
 logger = logging.getLogger(__name__)
 
 T = TypeVar('T')
 
+# Exceptions raised when the request never got a response
+NETWORK_ERRORS = (ConnectionError, TimeoutError, RequestsConnectionError, Timeout)
+
+# Gateway statuses that usually clear up on retry
+RETRYABLE_STATUSES = frozenset({502, 503, 504})
+
 
 class RateLimitError(Exception):
     """Raised when API rate limit is hit."""
     pass
 
 
+def retry_after_seconds(error: Exception) -> Optional[float]:
+    """
+    Read the server's requested wait from an HTTP error's Retry-After header.
+
+    Args:
+        error: Exception raised by an API call; requests' HTTPError carries
+            the response that caused it
+
+    Returns:
+        Seconds to wait, or None if the error has no usable Retry-After
+    """
+    response = getattr(error, 'response', None)
+    headers = getattr(response, 'headers', None)
+    value = headers.get('Retry-After') if headers is not None else None
+    if not value:
+        return None
+
+    # Either a number of seconds or an HTTP date
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
 def with_retry(
     func: Callable[..., T],
     *args,
     max_attempts: int = 3,
     base_delay: float = 1.0,
     max_delay: float = 60.0,
+    limiter: Optional[AIMDLimiter] = None,
     **kwargs
 ) -> T:
     """
     Retry a function with exponential backoff.
 
-    Handles network errors, timeouts, and rate limiting (429 errors).
+    Each delay is jittered between half and all of the backoff ("equal
+    jitter"), so workers that fail together don't all retry together. When
+    the server sends Retry-After, the delay is at least that long (still
+    capped at max_delay).
+    Handles network errors, timeouts, rate limiting (429 errors) and
+    gateway errors (502, 503, 504).
 
     Args:
         func: Function to retry
@@ -33,6 +79,8 @@ def with_retry(
         max_attempts: Maximum number of attempts (default 3)
         base_delay: Initial delay in seconds (default 1.0)
         max_delay: Maximum delay in seconds (default 60.0)
+        limiter: Optional concurrency limiter shared by parallel callers; each
+            attempt waits for a slot and reports its outcome and latency
         **kwargs: Keyword arguments to pass to func
 
     Returns:
@@ -44,18 +92,35 @@ def with_retry(
     last_exception = None
 
     for attempt in range(max_attempts):
+        if limiter is not None:
+            limiter.acquire()
+        started = time.monotonic()
+
         try:
-            return func(*args, **kwargs)
+            result = func(*args, **kwargs)
 
         except Exception as e:
             last_exception = e
-            error_str = str(e)
-
-            # Check if this is a retryable error
-            is_network_error = isinstance(e, (ConnectionError, TimeoutError))
-            is_rate_limit = '429' in error_str or 'Too Many Requests' in error_str
 
-            if not (is_network_error or is_rate_limit):
+            # Check if this is a retryable error. HTTP errors carry their
+            # response, so check its status rather than the message text
+            status = getattr(getattr(e, 'response', None), 'status_code', None)
+            is_network_error = isinstance(e, NETWORK_ERRORS)
+            if status is not None:
+                is_rate_limit = status == 429
+                is_server_error = status in RETRYABLE_STATUSES
+            else:
+                error_str = str(e)
+                is_rate_limit = '429' in error_str or 'Too Many Requests' in error_str
+                is_server_error = False
+            is_retryable = is_network_error or is_rate_limit or is_server_error
+
+            # Free the slot before any backoff sleep; only retryable errors
+            # say the API is overloaded
+            if limiter is not None:
+                limiter.release(not is_retryable, time.monotonic() - started)
+
+            if not is_retryable:
                 # Not a retryable error, raise immediately
                 raise
 
@@ -64,16 +129,27 @@ def with_retry(
                 logger.error(f"Failed after {max_attempts} attempts: {e}")
                 raise
 
-            # Calculate delay with exponential backoff
-            delay = min(base_delay * (2 ** attempt), max_delay)
+            # Calculate delay with exponential backoff and equal jitter
+            backoff = min(base_delay * (2 ** attempt), max_delay)
+            delay = random.uniform(backoff / 2, backoff)
+
+            # The server knows when the rate limit resets; don't retry sooner
+            retry_after = retry_after_seconds(e)
+            if retry_after is not None:
+                delay = min(max(delay, retry_after), max_delay)
 
             logger.info(
                 f"Attempt {attempt + 1}/{max_attempts} failed: {e}. "
-                f"Retrying in {delay}s..."
+                f"Retrying in {delay:.1f}s..."
             )
 
             time.sleep(delay)
 
+        else:
+            if limiter is not None:
+                limiter.release(True, time.monotonic() - started)
+            return result
+
     # Should never reach here, but just in case
     raise last_exception
 
@@ -3,20 +3,13 @@ import sqlite3
 from taxa.taxonomy import TAXONOMIC_RANKS
 
 
-def create_schema(conn: sqlite3.Connection) -> None:
-    """
-    Create database schema with all tables and indexes.
-
-    Args:
-        conn: SQLite database connection
-    """
-    cursor = conn.cursor()
-
-    # Build rank columns dynamically from TAXONOMIC_RANKS
-    rank_columns = ',\n            '.join(f"{rank} TEXT" for rank in TAXONOMIC_RANKS)
+# Rank columns built from TAXONOMIC_RANKS
+_RANK_COLUMNS_SQL = ',\n            '.join(f"{rank} TEXT" for rank in TAXONOMIC_RANKS)
 
+# Table definitions, built once at import
+TABLE_STATEMENTS = (
     # Taxa table with wide schema (all ranks as columns)
-    cursor.execute(f"""
+    f"""
         CREATE TABLE IF NOT EXISTS taxa (
             id INTEGER PRIMARY KEY,
             scientific_name TEXT NOT NULL,
@@ -24,16 +17,20 @@ def create_schema(conn: sqlite3.Connection) -> None:
             rank TEXT NOT NULL,
 
             -- All possible taxonomic ranks
-            {rank_columns},
+            {_RANK_COLUMNS_SQL},
 
             -- Metadata
             is_active BOOLEAN,
-            iconic_taxon TEXT
+            iconic_taxon TEXT,
+
+            -- Fetch bookkeeping, so a re-sync can reuse recently fetched taxa
+            last_fetched INTEGER,  -- Unix time; NULL for ancestor-only rows
+            ancestor_ids TEXT      -- JSON list of ancestor taxon IDs
         )
-    """)
+    """,
 
     # Observations table with aggregated data
-    cursor.execute("""
+    """
         CREATE TABLE IF NOT EXISTS observations (
             taxon_id INTEGER NOT NULL,
             region_key TEXT NOT NULL,
@@ -49,30 +46,65 @@ def create_schema(conn: sqlite3.Connection) -> None:
             PRIMARY KEY (taxon_id, place_id),
             FOREIGN KEY (taxon_id) REFERENCES taxa(id)
         )
-    """)
+    """,
 
     # Regions metadata
-    cursor.execute("""
+    """
         CREATE TABLE IF NOT EXISTS regions (
             key TEXT PRIMARY KEY,
             name TEXT NOT NULL,
             place_ids TEXT NOT NULL
         )
-    """)
+    """,
 
     # Sync metadata
-    cursor.execute("""
+    """
         CREATE TABLE IF NOT EXISTS sync_info (
             key TEXT PRIMARY KEY,
             value TEXT
         )
-    """)
+    """,
+)
 
-    # Create indexes for common query patterns
-    cursor.execute("CREATE INDEX IF NOT EXISTS idx_taxa_family ON taxa(family)")
-    cursor.execute("CREATE INDEX IF NOT EXISTS idx_taxa_genus ON taxa(genus)")
-    cursor.execute("CREATE INDEX IF NOT EXISTS idx_taxa_subfamily ON taxa(subfamily)")
-    cursor.execute("CREATE INDEX IF NOT EXISTS idx_taxa_tribe ON taxa(tribe)")
-    cursor.execute("CREATE INDEX IF NOT EXISTS idx_obs_region ON observations(region_key)")
+# Index every rank column: find_taxon_rank and breakdown filters look up
+# taxa by name at any rank, which would otherwise scan the whole table
+INDEX_STATEMENTS = tuple(
+    f"CREATE INDEX IF NOT EXISTS idx_taxa_{rank} ON taxa({rank})"
+    for rank in TAXONOMIC_RANKS
+) + (
+    "CREATE INDEX IF NOT EXISTS idx_obs_region ON observations(region_key)",
+)
+
+
+def create_schema(conn: sqlite3.Connection, indexes: bool = True) -> None:
+    """
+    Create database schema with all tables and indexes.
+
+    Args:
+        conn: SQLite database connection
+        indexes: If False, create only the tables; bulk loaders call
+            create_indexes after inserting, which builds each index in
+            one pass instead of updating it row by row
+    """
+    cursor = conn.cursor()
+
+    for statement in TABLE_STATEMENTS:
+        cursor.execute(statement)
+
+    if indexes:
+        create_indexes(conn)
 
     conn.commit()
+
+
+def create_indexes(conn: sqlite3.Connection) -> None:
+    """
+    Create the secondary indexes.
+
+    Does not commit; the caller owns the transaction.
+
+    Args:
+        conn: SQLite database connection
+    """
+    for statement in INDEX_STATEMENTS:
+        conn.execute(statement)
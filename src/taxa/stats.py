@@ -0,0 +1,77 @@
+"""Summary statistics cached in the sync_info table."""
+import sqlite3
+from typing import Dict, Optional
+
+
+# Query for each count shown by `taxa info`, keyed by its sync_info key
+STAT_QUERIES = {
+    'taxa_count': "SELECT COUNT(*) FROM taxa",
+    'region_count': "SELECT COUNT(DISTINCT region_key) FROM observations",
+    'obs_rows': "SELECT COUNT(*) FROM observations",
+    'total_observation_count': "SELECT COALESCE(SUM(observation_count), 0) FROM observations",
+}
+
+# sync_info keys holding the counts shown by `taxa info`
+STAT_KEYS = tuple(STAT_QUERIES)
+
+# All counts as scalar subqueries of one statement: one prepare and one
+# round-trip, and a fixed string so sqlite3's statement cache can reuse it
+STATS_SQL = "SELECT " + ", ".join(f"({sql})" for sql in STAT_QUERIES.values())
+
+
+def compute_stats(conn: sqlite3.Connection) -> Dict[str, int]:
+    """
+    Count taxa and observations by scanning the tables.
+
+    Args:
+        conn: SQLite database connection
+
+    Returns:
+        Dictionary with a value for each key in STAT_KEYS
+    """
+    return dict(zip(STAT_KEYS, conn.execute(STATS_SQL).fetchone()))
+
+
+def store_stats(conn: sqlite3.Connection, stats: Dict[str, int]) -> None:
+    """
+    Write counts to sync_info so later reads skip the table scans.
+
+    Does not commit; the caller owns the transaction.
+
+    Args:
+        conn: SQLite database connection
+        stats: Counts as returned by compute_stats
+    """
+    conn.executemany(
+        "INSERT OR REPLACE INTO sync_info (key, value) VALUES (?, ?)",
+        [(key, str(stats[key])) for key in STAT_KEYS]
+    )
+
+
+def read_sync_info(conn: sqlite3.Connection) -> Dict[str, str]:
+    """
+    Read every sync_info entry in one query.
+
+    Args:
+        conn: SQLite database connection
+
+    Returns:
+        Dictionary mapping sync_info keys to their stored values
+    """
+    return dict(conn.execute("SELECT key, value FROM sync_info").fetchall())
+
+
+def cached_stats(sync_info: Dict[str, str]) -> Optional[Dict[str, int]]:
+    """
+    Extract cached counts from sync_info entries.
+
+    Args:
+        sync_info: Entries as returned by read_sync_info
+
+    Returns:
+        Dictionary with a value for each key in STAT_KEYS, or None if the
+        database predates cached counts
+    """
+    if not all(key in sync_info for key in STAT_KEYS):
+        return None
+    return {key: int(sync_info[key]) for key in STAT_KEYS}
@@ -1,19 +1,208 @@
 """Sync data from iNaturalist to SQLite database."""
 import sqlite3
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, Iterator, List, Set
 import json
 import os
+import time
+from operator import itemgetter
 
 from tqdm import tqdm
 from taxa.config import Config
-from taxa.schema import create_schema
+from taxa.db import connect
+from taxa.schema import create_schema, create_indexes
 from taxa.fetcher import fetch_regional_taxa
-from taxa.batch import fetch_taxa_batch
-from taxa.transform import flatten_taxon_ancestry
+from taxa.batch import fetch_taxa_batch, MAX_IDS_PER_REQUEST
+from taxa.transform import flatten_taxon_ancestry, TAXA_COLUMNS, ANCESTOR_COLUMNS
+from taxa.stats import compute_stats, store_stats
 from pyinaturalist import get_taxa_by_id
 
 
+# Taxa fetched within this many seconds are copied from the database being
+# replaced instead of being fetched from the API again.
+TAXON_REUSE_MAX_AGE = 7 * 24 * 60 * 60
+
+# Regional discovery queries kept in flight at once. Small on purpose:
+# pyinaturalist's rate limiter paces the requests, so this only overlaps
+# round-trip latency.
+REGION_QUERY_WORKERS = 4
+
+# Write tuning for the database being built. It is a temporary file that
+# only replaces the real database by rename once complete, so a crash can
+# at worst lose a build that would be rerun anyway: WAL with relaxed
+# syncing is safe, and exclusive locking lets SQLite skip the shared-memory
+# index. Scoped to main so the attached previous database is only read.
+BUILD_PRAGMAS = (
+    "PRAGMA main.locking_mode = EXCLUSIVE",
+    "PRAGMA main.journal_mode = WAL",
+    "PRAGMA main.synchronous = NORMAL",
+)
+
+# Buffered taxa rows written per executemany flush in Phase 2; bounds memory on
+# large syncs while still amortizing statement dispatch
+INSERT_BATCH_SIZE = 10000
+
+# Pull a row's values out in column order for positional binding, which
+# spares SQLite a name lookup per parameter
+taxon_values = itemgetter(*TAXA_COLUMNS)
+ancestor_values = itemgetter(*ANCESTOR_COLUMNS)
+
+# Insert statements, kept as fixed strings so sqlite3's statement cache
+# prepares each once per sync
+TAXON_INSERT_SQL = (
+    f"INSERT OR REPLACE INTO taxa ({', '.join(TAXA_COLUMNS)}) "
+    f"VALUES ({', '.join('?' * len(TAXA_COLUMNS))})"
+)
+
+# Ancestors use INSERT OR IGNORE to avoid overwriting taxa that were
+# batch-fetched with full details. Ancestor objects lack their own
+# 'ancestors' arrays, so re-inserting them would overwrite parent rank
+# data with NULLs.
+ANCESTOR_INSERT_SQL = (
+    f"INSERT OR IGNORE INTO taxa ({', '.join(ANCESTOR_COLUMNS)}) "
+    f"VALUES ({', '.join('?' * len(ANCESTOR_COLUMNS))})"
+)
+
+OBSERVATION_INSERT_SQL = """
+    INSERT OR REPLACE INTO observations (
+        taxon_id, region_key, place_id,
+        observation_count, observer_count,
+        research_grade_count,
+        first_observed, last_observed
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+def attach_previous_database(conn: sqlite3.Connection, path: str) -> bool:
+    """
+    Attach the database being replaced as 'previous' for taxon reuse.
+
+    Args:
+        conn: Connection to the database being built
+        path: Path of the existing database
+
+    Returns:
+        True if attached; False if there is no previous database or it
+        predates fetch bookkeeping
+    """
+    if not os.path.exists(path):
+        return False
+
+    conn.execute("ATTACH DATABASE ? AS previous", (path,))
+
+    columns = {row[1] for row in conn.execute("PRAGMA previous.table_info(taxa)")}
+    if not {'last_fetched', 'ancestor_ids'} <= columns:
+        conn.execute("DETACH DATABASE previous")
+        return False
+
+    return True
+
+
+def reuse_previous_taxa(
+    conn: sqlite3.Connection,
+    taxon_ids: List[int],
+    max_age: int = TAXON_REUSE_MAX_AGE
+) -> Set[int]:
+    """
+    Copy recently fetched taxa and their ancestors from the previous database.
+
+    Expects the previous database attached by attach_previous_database.
+    Taxa are matched through a temporary table, so any number of IDs can
+    be looked up without hitting SQLite's parameter limit.
+
+    Args:
+        conn: Connection to the database being built
+        taxon_ids: Taxon IDs wanted in the new database
+        max_age: Maximum age in seconds of a reusable taxon
+
+    Returns:
+        Set of taxon IDs copied; the rest still need fetching
+    """
+    cutoff = int(time.time()) - max_age
+    columns = ', '.join(row[1] for row in conn.execute("PRAGMA main.table_info(taxa)"))
+
+    conn.execute("CREATE TEMP TABLE IF NOT EXISTS wanted (id INTEGER PRIMARY KEY)")
+    conn.execute("DELETE FROM wanted")
+    conn.executemany("INSERT OR IGNORE INTO wanted (id) VALUES (?)", ((i,) for i in taxon_ids))
+
+    reused = {
+        row[0] for row in conn.execute(
+            "SELECT id FROM previous.taxa WHERE id IN wanted AND last_fetched >= ?",
+            (cutoff,)
+        )
+    }
+
+    conn.execute(f"""
+        INSERT OR REPLACE INTO taxa ({columns})
+        SELECT {columns} FROM previous.taxa
+        WHERE id IN wanted AND last_fetched >= ?
+    """, (cutoff,))
+
+    # Ancestors only fill gaps, as in the fetch path
+    conn.execute(f"""
+        INSERT OR IGNORE INTO taxa ({columns})
+        SELECT {columns} FROM previous.taxa
+        WHERE id IN (
+            SELECT ancestor.value
+            FROM previous.taxa AS t, json_each(t.ancestor_ids) AS ancestor
+            WHERE t.id IN wanted AND t.last_fetched >= ?
+        )
+    """, (cutoff,))
+
+    return reused
+
+
+def iter_observation_rows(
+    regional_taxa: Dict[int, Dict[str, Dict[int, Dict[str, Any]]]],
+    taxon_ids: Set[int]
+) -> Iterator[tuple]:
+    """
+    Generate observation rows from counts collected during regional discovery.
+
+    Rows are yielded one at a time so executemany can stream them through a
+    single prepared statement without building a list of every row.
+    observer_count, research_grade_count, first_observed and last_observed
+    are not available from regional discovery and are left NULL.
+
+    Args:
+        regional_taxa: taxon_id -> {region_key -> {place_id -> obs_data}}
+        taxon_ids: Taxa to generate rows for; others are skipped
+
+    Yields:
+        Row tuples for OBSERVATION_INSERT_SQL
+    """
+    for taxon_id, places_by_region in regional_taxa.items():
+        if taxon_id not in taxon_ids:
+            continue
+        for region_key, places in places_by_region.items():
+            for place_id, obs_data in places.items():
+                yield (taxon_id, region_key, place_id, obs_data['observation_count'],
+                       None, None, None, None)
+
+
+def write_rows(
+    cursor: sqlite3.Cursor,
+    taxon_rows: List[tuple],
+    ancestor_rows: List[tuple]
+) -> None:
+    """
+    Write buffered rows with one executemany per statement, then clear them.
+
+    Fetched taxa are written before ancestors, so an ancestor row (which
+    lacks its own ancestry) never takes the place of a fully fetched taxon.
+
+    Args:
+        cursor: Database cursor
+        taxon_rows: Rows for TAXON_INSERT_SQL
+        ancestor_rows: Rows for ANCESTOR_INSERT_SQL
+    """
+    cursor.executemany(TAXON_INSERT_SQL, taxon_rows)
+    cursor.executemany(ANCESTOR_INSERT_SQL, ancestor_rows)
+    taxon_rows.clear()
+    ancestor_rows.clear()
+
+
 def sync_database(config: Config, dry_run: bool = False) -> None:
     """
     Sync iNaturalist data to SQLite database based on config.
@@ -36,14 +225,29 @@ def sync_database(config: Config, dry_run: bool = False) -> None:
     temp_db = f"{config.database}.new"
 
     print(f"Building database: {temp_db}")
-    conn = sqlite3.connect(temp_db)
+    conn = connect(temp_db)
+    for pragma in BUILD_PRAGMAS:
+        conn.execute(pragma)
 
     try:
-        # Create schema
-        create_schema(conn)
+        # Create tables; indexes are built once the data is loaded
+        create_schema(conn, indexes=False)
+
+        # Taxa fetched recently by the previous sync can be copied over
+        has_previous = attach_previous_database(conn, config.database)
+
+        # Load everything in one transaction, committed once at the end. A
+        # failed sync never renames the build file into place, so there is
+        # nothing to gain from committing partial progress.
+        conn.execute("BEGIN IMMEDIATE")
 
         # Store region metadata
         cursor = conn.cursor()
+
+        # Taxa already written or buffered with a row this sync; shared
+        # ancestors (kingdom, family, ...) would otherwise be flattened and
+        # written once per descendant, only to be ignored by INSERT OR IGNORE
+        seen_ancestor_ids = set()
         for key, region in config.regions.items():
             cursor.execute(
                 "INSERT INTO regions (key, name, place_ids) VALUES (?, ?, ?)",
@@ -57,51 +261,68 @@ def sync_database(config: Config, dry_run: bool = False) -> None:
             # Phase 1: Discover which taxa occur in regions
             print(f"Discovering regional taxa...")
 
-            # Calculate total queries for progress
-            total_queries = sum(len(region['place_ids']) for region in config.regions.values())
+            # Each distinct place is queried once per taxon, even when
+            # several regions list it; remember a region name for progress
+            place_regions = {}  # place_id -> name of the first region listing it
+            for region in config.regions.values():
+                for place_id in region['place_ids']:
+                    place_regions.setdefault(place_id, region['name'])
+
+            total_queries = len(place_regions)
 
             print(f"  Regions: {len(config.regions)}")
             print(f"  Total queries: {total_queries}\n")
 
-            regional_taxa = {}  # taxon_id -> {region_key -> {place_id -> obs_data}}
-
-            with tqdm(total=total_queries, desc="Querying regions", unit="query") as pbar:
-                for region_key, region in config.regions.items():
-                    for place_id in region['place_ids']:
-                        # Update progress bar with current query
-                        pbar.set_postfix_str(
-                            f"{taxon_config['name'][:20]} in {region['name'][:20]}"
-                        )
-
-                        # Callback to update progress during pagination
-                        def update_pagination_progress(page: int, fetched: int) -> None:
-                            pbar.set_postfix_str(
-                                f"{taxon_config['name'][:20]} in {region['name'][:20]} (page {page}, {fetched} taxa)"
-                            )
-
-                        # Fetch all taxa with observations in this place
-                        taxa = fetch_regional_taxa(
+            place_taxa = {}  # place_id -> taxa with observations there
+
+            # Queries are independent, so a few run at once; pyinaturalist's
+            # rate limiter still paces the requests themselves
+            workers = max(1, min(REGION_QUERY_WORKERS, total_queries))
+            executor = ThreadPoolExecutor(max_workers=workers)
+            try:
+                with tqdm(total=total_queries, desc="Querying regions", unit="query") as pbar:
+                    futures = {
+                        executor.submit(
+                            fetch_regional_taxa,
                             taxon_id=taxon_config['taxon_id'],
                             place_id=place_id,
-                            quality_grade=config.filters.get('quality_grade'),
-                            progress_callback=update_pagination_progress
+                            quality_grade=config.filters.get('quality_grade')
+                        ): place_id
+                        for place_id in place_regions
+                    }
+
+                    # Progress is reported here on the main thread as each
+                    # query lands; tqdm isn't safe to update from the workers
+                    for future in as_completed(futures):
+                        place_id = futures[future]
+                        taxa = place_taxa[place_id] = future.result()
+
+                        pbar.set_postfix_str(
+                            f"{taxon_config['name'][:20]} in {place_regions[place_id][:20]} ({len(taxa)} taxa)"
                         )
+                        pbar.update(1)
+            finally:
+                # On a failed query or Ctrl-C, drop the queries not yet
+                # started instead of sending them before exiting
+                executor.shutdown(wait=False, cancel_futures=True)
 
-                        # Store observation data by taxon/region/place
-                        for taxon in taxa:
-                            taxon_id = taxon['id']
+            # Store observation data by taxon/region/place, in config order
+            regional_taxa = {}  # taxon_id -> {region_key -> {place_id -> obs_data}}
 
-                            if taxon_id not in regional_taxa:
-                                regional_taxa[taxon_id] = {}
-                            if region_key not in regional_taxa[taxon_id]:
-                                regional_taxa[taxon_id][region_key] = {}
+            for region_key, region in config.regions.items():
+                for place_id in region['place_ids']:
+                    for taxon in place_taxa[place_id]:
+                        taxon_id = taxon['id']
 
-                            regional_taxa[taxon_id][region_key][place_id] = {
-                                'observation_count': taxon['descendant_obs_count'],
-                                'direct_count': taxon.get('direct_obs_count', 0)
-                            }
+                        if taxon_id not in regional_taxa:
+                            regional_taxa[taxon_id] = {}
+                        if region_key not in regional_taxa[taxon_id]:
+                            regional_taxa[taxon_id][region_key] = {}
 
-                        pbar.update(1)
+                        regional_taxa[taxon_id][region_key][place_id] = {
+                            'observation_count': taxon['descendant_obs_count'],
+                            'direct_count': taxon.get('direct_obs_count', 0)
+                        }
 
             print(f"\nTotal unique taxa discovered: {len(regional_taxa)}")
 
@@ -114,100 +335,90 @@ def sync_database(config: Config, dry_run: bool = False) -> None:
 
             taxon_ids = list(regional_taxa.keys())
 
+            reused_ids = reuse_previous_taxa(conn, taxon_ids) if has_previous else set()
+            if reused_ids:
+                print(f"  Reusing {len(reused_ids)} taxa fetched in the last "
+                      f"{TAXON_REUSE_MAX_AGE // 86400} days from {config.database}")
+
+            ids_to_fetch = [taxon_id for taxon_id in taxon_ids if taxon_id not in reused_ids]
+
             with tqdm(total=len(taxon_ids), desc="Processing taxa", unit="taxon") as pbar:
 
+                taxon_rows, ancestor_rows = [], []
+
+                pbar.update(len(reused_ids))
+
                 def update_progress(batch_num, total_batches):
-                    # Update progress bar by batch size (approximation)
-                    pass  # tqdm updates happen per taxon below
+                    # Advance as each batch of 30 arrives; fetching is what
+                    # takes time, writing the rows afterwards takes milliseconds
+                    done = len(reused_ids) + min(batch_num * MAX_IDS_PER_REQUEST, len(ids_to_fetch))
+                    pbar.update(done - pbar.n)
 
-                taxa = fetch_taxa_batch(taxon_ids, batch_size=30, callback=update_progress)
+                taxa = fetch_taxa_batch(
+                    ids_to_fetch, batch_size=MAX_IDS_PER_REQUEST, callback=update_progress
+                )
+                fetched_at = int(time.time())
 
                 # Track which taxa were successfully fetched
                 fetched_ids = {taxon['id'] for taxon in taxa}
-                missing_ids = set(taxon_ids) - fetched_ids
+                missing_ids = set(ids_to_fetch) - fetched_ids
 
                 if missing_ids:
                     print(f"\nWARNING: Failed to fetch {len(missing_ids)} taxa: {sorted(list(missing_ids)[:10])}")
                     if len(missing_ids) > 10:
                         print(f"  ... and {len(missing_ids) - 10} more")
 
+                # Reused and fetched taxa get full rows of their own, so
+                # don't flatten them again when they turn up as ancestors
+                seen_ancestor_ids.update(reused_ids)
+                seen_ancestor_ids.update(fetched_ids)
+
                 for taxon in taxa:
-                    taxon_id = taxon['id']
+                    ancestors = taxon.get('ancestors', [])
 
-                    # Insert main taxon
+                    # Main taxon
                     row = flatten_taxon_ancestry(taxon)
-                    cursor.execute("""
-                        INSERT OR REPLACE INTO taxa (
-                            id, scientific_name, common_name, rank,
-                            kingdom, phylum, class, order_name, family,
-                            subfamily, tribe, subtribe, genus, subgenus,
-                            section, subsection, species, subspecies, variety, form,
-                            is_active, iconic_taxon
-                        ) VALUES (
-                            :id, :scientific_name, :common_name, :rank,
-                            :kingdom, :phylum, :class, :order_name, :family,
-                            :subfamily, :tribe, :subtribe, :genus, :subgenus,
-                            :section, :subsection, :species, :subspecies, :variety, :form,
-                            :is_active, :iconic_taxon
-                        )
-                    """, row)
+                    row['last_fetched'] = fetched_at
+                    row['ancestor_ids'] = json.dumps([a['id'] for a in ancestors if 'id' in a])
+                    taxon_rows.append(taxon_values(row))
 
-                    # Insert all ancestors (for complete hierarchy)
-                    # Use INSERT OR IGNORE to avoid overwriting taxa that were batch-fetched
-                    # with full details. Ancestor objects lack their own 'ancestors' arrays,
-                    # so re-inserting them would overwrite parent rank data with NULLs.
-                    ancestors = taxon.get('ancestors', [])
+                    # All ancestors (for complete hierarchy)
                     for ancestor in ancestors:
-                        ancestor_row = flatten_taxon_ancestry(ancestor)
-                        cursor.execute("""
-                            INSERT OR IGNORE INTO taxa (
-                                id, scientific_name, common_name, rank,
-                                kingdom, phylum, class, order_name, family,
-                                subfamily, tribe, subtribe, genus, subgenus,
-                                section, subsection, species, subspecies, variety, form,
-                                is_active, iconic_taxon
-                            ) VALUES (
-                                :id, :scientific_name, :common_name, :rank,
-                                :kingdom, :phylum, :class, :order_name, :family,
-                                :subfamily, :tribe, :subtribe, :genus, :subgenus,
-                                :section, :subsection, :species, :subspecies, :variety, :form,
-                                :is_active, :iconic_taxon
-                            )
-                        """, ancestor_row)
-
-                    # Insert observation data (already collected in Phase 1)
-                    for region_key, places in regional_taxa[taxon_id].items():
-                        for place_id, obs_data in places.items():
-                            cursor.execute("""
-                                INSERT OR REPLACE INTO observations (
-                                    taxon_id, region_key, place_id,
-                                    observation_count, observer_count,
-                                    research_grade_count,
-                                    first_observed, last_observed
-                                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                            """, (
-                                taxon_id,
-                                region_key,
-                                place_id,
-                                obs_data['observation_count'],
-                                None,  # observer_count not available
-                                None,  # research_grade_count not available
-                                None,  # first_observed not available
-                                None   # last_observed not available
-                            ))
-
-                    pbar.update(1)
-
-            conn.commit()
-
-        # Store sync metadata
+                        ancestor_id = ancestor.get('id')
+                        if ancestor_id in seen_ancestor_ids:
+                            continue
+                        seen_ancestor_ids.add(ancestor_id)
+                        ancestor_rows.append(ancestor_values(flatten_taxon_ancestry(ancestor)))
+
+                    if len(taxon_rows) + len(ancestor_rows) >= INSERT_BATCH_SIZE:
+                        write_rows(cursor, taxon_rows, ancestor_rows)
+
+                write_rows(cursor, taxon_rows, ancestor_rows)
+
+                # Observation data (already collected in Phase 1) for every
+                # taxon that has a row, streamed straight from regional_taxa
+                cursor.executemany(
+                    OBSERVATION_INSERT_SQL,
+                    iter_observation_rows(regional_taxa, reused_ids | fetched_ids)
+                )
+
+        # Build each index in one pass over the loaded tables
+        create_indexes(conn)
+
+        # Store sync metadata, including counts for `taxa info`
         from datetime import datetime
+        store_stats(conn, compute_stats(conn))
         cursor.execute(
             "INSERT INTO sync_info (key, value) VALUES (?, ?)",
             ('last_sync', datetime.now().isoformat())
         )
         conn.commit()
 
+        # Fold the WAL back into the file and return to a rollback journal,
+        # so the renamed database is self-contained and read-only
+        # connections can open it without creating -wal/-shm files
+        conn.execute("PRAGMA main.journal_mode = DELETE")
+
         print("\n\nSync complete!")
 
     finally:
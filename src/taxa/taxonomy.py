@@ -20,6 +20,17 @@ TAXONOMIC_RANKS = [
     'form'
 ]
 
+# Position of each rank in TAXONOMIC_RANKS, for constant-time comparisons
+_RANK_INDEX = {rank: idx for idx, rank in enumerate(TAXONOMIC_RANKS)}
+
+
+def _rank_index(rank):
+    """Look up a rank's position, raising ValueError for unknown ranks."""
+    try:
+        return _RANK_INDEX[rank]
+    except KeyError:
+        raise ValueError(f"Unknown rank: {rank}") from None
+
 
 def get_next_ranks(current_rank, count=1):
     """Get the next N ranks in hierarchy after current_rank.
@@ -34,10 +45,7 @@ def get_next_ranks(current_rank, count=1):
     Raises:
         ValueError: If current_rank not in TAXONOMIC_RANKS
     """
-    if current_rank not in TAXONOMIC_RANKS:
-        raise ValueError(f"Unknown rank: {current_rank}")
-
-    idx = TAXONOMIC_RANKS.index(current_rank)
+    idx = _rank_index(current_rank)
     return TAXONOMIC_RANKS[idx+1:idx+1+count]
 
 
@@ -53,11 +61,7 @@ def sort_ranks(ranks):
     Raises:
         ValueError: If any rank is not in TAXONOMIC_RANKS
     """
-    for rank in ranks:
-        if rank not in TAXONOMIC_RANKS:
-            raise ValueError(f"Unknown rank: {rank}")
-
-    return sorted(ranks, key=lambda r: TAXONOMIC_RANKS.index(r))
+    return sorted(ranks, key=_rank_index)
 
 
 def validate_rank_sequence(base_rank, requested_ranks):
@@ -73,17 +77,10 @@ def validate_rank_sequence(base_rank, requested_ranks):
     Raises:
         ValueError: If any requested rank is not below base_rank
     """
-    if base_rank not in TAXONOMIC_RANKS:
-        raise ValueError(f"Unknown rank: {base_rank}")
-
-    base_idx = TAXONOMIC_RANKS.index(base_rank)
+    base_idx = _rank_index(base_rank)
 
     for rank in requested_ranks:
-        if rank not in TAXONOMIC_RANKS:
-            raise ValueError(f"Unknown rank: {rank}")
-
-        rank_idx = TAXONOMIC_RANKS.index(rank)
-        if rank_idx <= base_idx:
+        if _rank_index(rank) <= base_idx:
             raise ValueError(
                 f"Cannot break down to '{rank}' - it's not below '{base_rank}'"
             )
@@ -1,38 +1,29 @@
 """Transform iNaturalist API responses into database rows."""
 from typing import Dict, Any
 
+from taxa.taxonomy import TAXONOMIC_RANKS as RANK_COLUMNS
 
-# All taxonomic ranks we might encounter
-RANK_COLUMNS = [
-    'kingdom',
-    'phylum',
-    'class',
-    'order_name',  # 'order' is SQL keyword
-    'family',
-    'subfamily',
-    'tribe',
-    'subtribe',
-    'genus',
-    'subgenus',
-    'section',
-    'subsection',
-    'species',
-    'subspecies',
-    'variety',
-    'form',
-]
-
-
-def _rank_to_column_name(rank: str) -> str:
-    """Convert rank name to database column name.
 
-    Args:
-        rank: Taxonomic rank name
+# API rank name -> rank column, with 'order' mapped to 'order_name'. Ranks
+# without a column (e.g. 'hybrid', 'zoosection') are absent.
+_RANK_TO_COLUMN = {rank_col: rank_col for rank_col in RANK_COLUMNS}
+_RANK_TO_COLUMN['order'] = 'order_name'
 
-    Returns:
-        Column name for the rank, with 'order' mapped to 'order_name'
-    """
-    return 'order_name' if rank == 'order' else rank
+# Every rank column set to None; copied as the start of each row
+_EMPTY_RANK_COLUMNS = dict.fromkeys(RANK_COLUMNS)
+
+# Columns of the taxa table a sync writes for a fetched taxon, in binding
+# order for positional inserts
+TAXA_COLUMNS = (
+    'id', 'scientific_name', 'common_name', 'rank',
+    *RANK_COLUMNS,
+    'is_active', 'iconic_taxon', 'last_fetched', 'ancestor_ids',
+)
+
+# The columns flatten_taxon_ancestry fills. Ancestor rows lack fetch
+# bookkeeping: they come from another taxon's ancestry and are never
+# reused on their own.
+ANCESTOR_COLUMNS = TAXA_COLUMNS[:-2]
 
 
 def flatten_taxon_ancestry(taxon: Dict[str, Any]) -> Dict[str, Any]:
@@ -67,8 +58,7 @@ def flatten_taxon_ancestry(taxon: Dict[str, Any]) -> Dict[str, Any]:
     }
 
     # Initialize all rank columns to None
-    for rank_col in RANK_COLUMNS:
-        row[rank_col] = None
+    row.update(_EMPTY_RANK_COLUMNS)
 
     # Fill in ranks from ancestors
     ancestors = taxon.get('ancestors', [])
@@ -77,20 +67,13 @@ def flatten_taxon_ancestry(taxon: Dict[str, Any]) -> Dict[str, Any]:
         if 'rank' not in ancestor or 'name' not in ancestor:
             continue
 
-        rank = ancestor['rank']
-        name = ancestor['name']
-
-        # Map rank to column name (handle 'order' -> 'order_name')
-        col_name = _rank_to_column_name(rank)
-
-        if col_name in RANK_COLUMNS:
-            row[col_name] = name
+        col_name = _RANK_TO_COLUMN.get(ancestor['rank'])
+        if col_name:
+            row[col_name] = ancestor['name']
 
     # Add self to appropriate rank column
-    self_rank = taxon['rank']
-    self_col = _rank_to_column_name(self_rank)
-
-    if self_col in RANK_COLUMNS:
+    self_col = _RANK_TO_COLUMN.get(taxon['rank'])
+    if self_col:
         row[self_col] = taxon['name']
 
     return row
@@ -1,23 +1,20 @@
 """Shared test fixtures."""
-import sqlite3
 import pytest
 from click.testing import CliRunner
 from pathlib import Path
 
+from tests.helpers import fast_connect
 
-@pytest.fixture
-def memory_sample_db():
-    """Create in-memory test database with Rosaceae family test data.
+
+def seed_sample_data(conn):
+    """Create the taxa and observations tables and insert the Rosaceae rows.
 
     Includes:
     - Rosaceae family with Dryadoideae subfamily (populated)
     - Dryadoideae subfamily with NULL tribe but Cercocarpus genus
     """
-    conn = sqlite3.connect(':memory:')
-    cursor = conn.cursor()
-
     # Create taxa table with full schema
-    cursor.execute("""
+    conn.execute("""
         CREATE TABLE taxa (
             id INTEGER PRIMARY KEY,
             scientific_name TEXT,
@@ -42,7 +39,7 @@ def memory_sample_db():
     """)
 
     # Create observations table
-    cursor.execute("""
+    conn.execute("""
         CREATE TABLE observations (
             taxon_id INTEGER,
             region_key TEXT,
@@ -51,39 +48,52 @@ def memory_sample_db():
         )
     """)
 
-    # Insert Rosaceae family row
-    cursor.execute("""
-        INSERT INTO taxa (id, scientific_name, rank, family)
-        VALUES (1, 'Rosaceae', 'family', 'Rosaceae')
-    """)
+    with conn:
+        conn.executemany("""
+            INSERT INTO taxa (id, scientific_name, rank, family, subfamily, tribe, genus)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        """, [
+            # Rosaceae family row
+            (1, 'Rosaceae', 'family', 'Rosaceae', None, None, None),
+            # Dryadoideae subfamily (subfamily is populated for Rosaceae)
+            (2, 'Dryadoideae', 'subfamily', 'Rosaceae', 'Dryadoideae', None, None),
+            # Cercocarpus genus (tribe is NULL, genus is populated)
+            (3, 'Cercocarpus', 'genus', 'Rosaceae', 'Dryadoideae', None, 'Cercocarpus'),
+        ])
+
+        # Observations for all taxa
+        conn.executemany("""
+            INSERT INTO observations (taxon_id, region_key, place_id, observation_count)
+            VALUES (?, ?, ?, ?)
+        """, [
+            (1, 'test_region', 1, 100),
+            (2, 'test_region', 1, 80),
+            (3, 'test_region', 1, 60),
+        ])
+
+
+@pytest.fixture(scope="module")
+def memory_sample_template():
+    """Create in-memory test database with Rosaceae family test data.
 
-    # Insert Dryadoideae subfamily (subfamily is populated for Rosaceae)
-    cursor.execute("""
-        INSERT INTO taxa (id, scientific_name, rank, family, subfamily)
-        VALUES (2, 'Dryadoideae', 'subfamily', 'Rosaceae', 'Dryadoideae')
-    """)
+    Built once per module; tests should use memory_sample_db, a copy they
+    are free to modify.
+    """
+    conn = fast_connect()
+    seed_sample_data(conn)
+    yield conn
+    conn.close()
 
-    # Insert Cercocarpus genus (tribe is NULL, genus is populated)
-    cursor.execute("""
-        INSERT INTO taxa (id, scientific_name, rank, family, subfamily, tribe, genus)
-        VALUES (3, 'Cercocarpus', 'genus', 'Rosaceae', 'Dryadoideae', NULL, 'Cercocarpus')
-    """)
 
-    # Insert observations for all taxa
-    cursor.execute("""
-        INSERT INTO observations (taxon_id, region_key, place_id, observation_count)
-        VALUES (1, 'test_region', 1, 100)
-    """)
-    cursor.execute("""
-        INSERT INTO observations (taxon_id, region_key, place_id, observation_count)
-        VALUES (2, 'test_region', 1, 80)
-    """)
-    cursor.execute("""
-        INSERT INTO observations (taxon_id, region_key, place_id, observation_count)
-        VALUES (3, 'test_region', 1, 60)
-    """)
+@pytest.fixture
+def memory_sample_db(memory_sample_template):
+    """Copy the Rosaceae template database into a fresh in-memory database.
 
-    conn.commit()
+    Connection.backup copies pages directly, skipping the schema and
+    inserts each test would otherwise re-run.
+    """
+    conn = fast_connect()
+    memory_sample_template.backup(conn)
     yield conn
     conn.close()
 
@@ -95,77 +105,8 @@ def sample_db(tmp_path):
     Returns a Path object pointing to the database file.
     """
     db_path = tmp_path / "sample.db"
-    conn = sqlite3.connect(str(db_path))
-    cursor = conn.cursor()
-
-    # Create taxa table with full schema
-    cursor.execute("""
-        CREATE TABLE taxa (
-            id INTEGER PRIMARY KEY,
-            scientific_name TEXT,
-            rank TEXT,
-            kingdom TEXT,
-            phylum TEXT,
-            class TEXT,
-            order_name TEXT,
-            family TEXT,
-            subfamily TEXT,
-            tribe TEXT,
-            subtribe TEXT,
-            genus TEXT,
-            subgenus TEXT,
-            section TEXT,
-            subsection TEXT,
-            species TEXT,
-            subspecies TEXT,
-            variety TEXT,
-            form TEXT
-        )
-    """)
-
-    # Create observations table
-    cursor.execute("""
-        CREATE TABLE observations (
-            taxon_id INTEGER,
-            region_key TEXT,
-            place_id INTEGER,
-            observation_count INTEGER
-        )
-    """)
-
-    # Insert Rosaceae family row
-    cursor.execute("""
-        INSERT INTO taxa (id, scientific_name, rank, family)
-        VALUES (1, 'Rosaceae', 'family', 'Rosaceae')
-    """)
-
-    # Insert Dryadoideae subfamily (subfamily is populated for Rosaceae)
-    cursor.execute("""
-        INSERT INTO taxa (id, scientific_name, rank, family, subfamily)
-        VALUES (2, 'Dryadoideae', 'subfamily', 'Rosaceae', 'Dryadoideae')
-    """)
-
-    # Insert Cercocarpus genus (tribe is NULL, genus is populated)
-    cursor.execute("""
-        INSERT INTO taxa (id, scientific_name, rank, family, subfamily, tribe, genus)
-        VALUES (3, 'Cercocarpus', 'genus', 'Rosaceae', 'Dryadoideae', NULL, 'Cercocarpus')
-    """)
-
-    # Insert observations for all taxa
-    cursor.execute("""
-        INSERT INTO observations (taxon_id, region_key, place_id, observation_count)
-        VALUES (1, 'test_region', 1, 100)
-    """)
-    cursor.execute("""
-        INSERT INTO observations (taxon_id, region_key, place_id, observation_count)
-        VALUES (2, 'test_region', 1, 80)
-    """)
-    cursor.execute("""
-        INSERT INTO observations (taxon_id, region_key, place_id, observation_count)
-        VALUES (3, 'test_region', 1, 60)
-    """)
-
-    conn.commit()
+    conn = fast_connect(str(db_path))
+    seed_sample_data(conn)
     conn.close()
     yield str(db_path)
 
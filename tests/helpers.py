@@ -0,0 +1,60 @@
+"""Helpers shared by the test modules."""
+import sqlite3
+from functools import lru_cache
+
+from taxa.schema import create_schema
+
+
+# Test databases are throwaway, so skip the durability work SQLite does by
+# default: no fsyncs, and the rollback journal and temp tables kept in memory
+FAST_PRAGMAS = """
+    PRAGMA synchronous = OFF;
+    PRAGMA journal_mode = MEMORY;
+    PRAGMA temp_store = MEMORY;
+"""
+
+
+def fast_connect(path=':memory:'):
+    """Open a SQLite connection tuned for test fixtures.
+
+    Args:
+        path: Database path (default: in-memory database)
+
+    Returns:
+        sqlite3.Connection with FAST_PRAGMAS applied
+    """
+    conn = sqlite3.connect(path)
+    conn.executescript(FAST_PRAGMAS)
+    return conn
+
+
+@lru_cache(maxsize=None)
+def schema_template():
+    """Serialize an empty database with the full schema, built once per run.
+
+    Returns:
+        Database image as bytes, for Connection.deserialize
+    """
+    conn = sqlite3.connect(':memory:')
+    create_schema(conn)
+    image = conn.serialize()
+    conn.close()
+    return image
+
+
+def schema_connect():
+    """Open an in-memory database with the full schema already in place.
+
+    Restoring the serialized template skips parsing and running the schema
+    DDL for every test.
+
+    Returns:
+        sqlite3.Connection with FAST_PRAGMAS applied
+    """
+    conn = fast_connect()
+    if hasattr(conn, 'deserialize'):
+        conn.deserialize(schema_template())
+    else:
+        # Connection.serialize/deserialize arrived in Python 3.11
+        create_schema(conn)
+    return conn
@@ -1,7 +1,17 @@
 """Test to reproduce the ancestor data overwriting bug."""
-import sqlite3
-from taxa.transform import flatten_taxon_ancestry
-from taxa.schema import create_schema
+from operator import itemgetter
+
+from taxa.transform import flatten_taxon_ancestry, ANCESTOR_COLUMNS
+from tests.helpers import schema_connect
+
+
+# Insert statement shared by both inserts, differing only in conflict
+# handling. Bound positionally, as sync does.
+INSERT_SQL = (
+    f"INSERT OR {{conflict}} INTO taxa ({', '.join(ANCESTOR_COLUMNS)}) "
+    f"VALUES ({', '.join('?' * len(ANCESTOR_COLUMNS))})"
+)
+row_values = itemgetter(*ANCESTOR_COLUMNS)
 
 
 def test_ancestor_insertion_preserves_parent_ranks():
@@ -15,8 +25,7 @@ def test_ancestor_insertion_preserves_parent_ranks():
     3. Verify parent ranks are still populated
     """
     # Create in-memory database
-    conn = sqlite3.connect(':memory:')
-    create_schema(conn)
+    conn = schema_connect()
     cursor = conn.cursor()
 
     # Simulate full taxon data (from fetch_taxa_batch)
@@ -38,22 +47,8 @@ def test_ancestor_insertion_preserves_parent_ranks():
 
     # Insert with full data
     row1 = flatten_taxon_ancestry(asteraceae_full)
-    cursor.execute("""
-        INSERT OR REPLACE INTO taxa (
-            id, scientific_name, common_name, rank,
-            kingdom, phylum, class, order_name, family,
-            subfamily, tribe, subtribe, genus, subgenus,
-            section, subsection, species, subspecies, variety, form,
-            is_active, iconic_taxon
-        ) VALUES (
-            :id, :scientific_name, :common_name, :rank,
-            :kingdom, :phylum, :class, :order_name, :family,
-            :subfamily, :tribe, :subtribe, :genus, :subgenus,
-            :section, :subsection, :species, :subspecies, :variety, :form,
-            :is_active, :iconic_taxon
-        )
-    """, row1)
-    conn.commit()
+    with conn:
+        conn.execute(INSERT_SQL.format(conflict='REPLACE'), row_values(row1))
 
     # Verify parent ranks are populated
     cursor.execute("SELECT kingdom, phylum, class, order_name FROM taxa WHERE id = 47604")
@@ -75,22 +70,8 @@ def test_ancestor_insertion_preserves_parent_ranks():
 
     # Insert again using INSERT OR IGNORE (simulating fixed sync.py:158)
     row2 = flatten_taxon_ancestry(asteraceae_as_ancestor)
-    cursor.execute("""
-        INSERT OR IGNORE INTO taxa (
-            id, scientific_name, common_name, rank,
-            kingdom, phylum, class, order_name, family,
-            subfamily, tribe, subtribe, genus, subgenus,
-            section, subsection, species, subspecies, variety, form,
-            is_active, iconic_taxon
-        ) VALUES (
-            :id, :scientific_name, :common_name, :rank,
-            :kingdom, :phylum, :class, :order_name, :family,
-            :subfamily, :tribe, :subtribe, :genus, :subgenus,
-            :section, :subsection, :species, :subspecies, :variety, :form,
-            :is_active, :iconic_taxon
-        )
-    """, row2)
-    conn.commit()
+    with conn:
+        conn.execute(INSERT_SQL.format(conflict='IGNORE'), row_values(row2))
 
     # FIX: Using INSERT OR IGNORE preserves the original full data
     cursor.execute("SELECT kingdom, phylum, class, order_name FROM taxa WHERE id = 47604")
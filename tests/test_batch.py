@@ -1,64 +1,138 @@
-from unittest.mock import patch
+import pytest
+import time
 from taxa.batch import fetch_taxa_batch
 
 
-def test_fetch_taxa_batch_single_batch():
+# Canned responses, built once; fetch_taxa_batch only reads them
+THREE_TAXA = {
+    'results': [
+        {'id': 1, 'name': 'Taxon 1', 'ancestors': []},
+        {'id': 2, 'name': 'Taxon 2', 'ancestors': []},
+        {'id': 3, 'name': 'Taxon 3', 'ancestors': []}
+    ]
+}
+FULL_BATCH = {'results': [{'id': i, 'name': f'Taxon {i}'} for i in range(30)]}
+PARTIAL_BATCH = {'results': [{'id': i, 'name': f'Taxon {i}'} for i in range(30, 35)]}
+
+
+def replace_with_retry(monkeypatch, respond):
+    """Substitute a plain function for taxa.batch.with_retry.
+
+    Args:
+        monkeypatch: pytest monkeypatch fixture
+        respond: Called with each requested batch of IDs; returns the response
+
+    Returns:
+        List that collects each requested batch, in call order
+    """
+    calls = []
+
+    def fake_retry(func, batch, **kwargs):
+        calls.append(batch)
+        return respond(batch)
+
+    monkeypatch.setattr('taxa.batch.with_retry', fake_retry)
+    return calls
+
+
+def echo_batch(batch):
+    """Respond with one minimal taxon per requested ID."""
+    return {'results': [{'id': i} for i in batch]}
+
+
+def test_fetch_taxa_batch_single_batch(monkeypatch):
     """Test fetching small number of taxa in one batch."""
-    with patch('taxa.batch.with_retry') as mock_retry:
-        mock_retry.return_value = {
-            'results': [
-                {'id': 1, 'name': 'Taxon 1', 'ancestors': []},
-                {'id': 2, 'name': 'Taxon 2', 'ancestors': []},
-                {'id': 3, 'name': 'Taxon 3', 'ancestors': []}
-            ]
-        }
+    calls = replace_with_retry(monkeypatch, lambda batch: THREE_TAXA)
 
-        result = fetch_taxa_batch([1, 2, 3])
+    result = fetch_taxa_batch([1, 2, 3])
 
-        # Should return all taxa
-        assert len(result) == 3
-        assert result[0]['id'] == 1
+    # Should return all taxa
+    assert len(result) == 3
+    assert result[0]['id'] == 1
 
-        # Should have called API once with list of IDs
-        assert mock_retry.call_count == 1
-        call_args = mock_retry.call_args[0]
-        assert call_args[1] == [1, 2, 3]
+    # Should have called API once with list of IDs
+    assert calls == [[1, 2, 3]]
 
 
-def test_fetch_taxa_batch_multiple_batches():
+def test_fetch_taxa_batch_multiple_batches(monkeypatch):
     """Test batching when taxa count exceeds batch size."""
-    with patch('taxa.batch.with_retry') as mock_retry:
-        # Mock responses for two batches
-        mock_retry.side_effect = [
-            {'results': [{'id': i, 'name': f'Taxon {i}'} for i in range(30)]},
-            {'results': [{'id': i, 'name': f'Taxon {i}'} for i in range(30, 35)]}
-        ]
+    # Responses for two batches
+    responses = iter([FULL_BATCH, PARTIAL_BATCH])
+    calls = replace_with_retry(monkeypatch, lambda batch: next(responses))
 
-        # Fetch 35 taxa (should be 2 batches of 30)
-        taxon_ids = list(range(35))
-        result = fetch_taxa_batch(taxon_ids, batch_size=30)
+    # Fetch 35 taxa (should be 2 batches of 30)
+    taxon_ids = list(range(35))
+    result = fetch_taxa_batch(taxon_ids, batch_size=30)
 
-        # Should return all taxa
-        assert len(result) == 35
+    # Should return all taxa
+    assert len(result) == 35
 
-        # Should have called API twice
-        assert mock_retry.call_count == 2
+    # Should have called API twice
+    assert len(calls) == 2
 
 
-def test_fetch_taxa_batch_with_callback():
+def test_fetch_taxa_batch_with_callback(monkeypatch):
     """Test progress callback invoked after each batch."""
-    with patch('taxa.batch.with_retry') as mock_retry:
-        mock_retry.side_effect = [
-            {'results': [{'id': i} for i in range(30)]},
-            {'results': [{'id': i} for i in range(30, 40)]}
-        ]
+    responses = iter([FULL_BATCH, PARTIAL_BATCH])
+    replace_with_retry(monkeypatch, lambda batch: next(responses))
+
+    batches_completed = []
+
+    def callback(batch_num, total_batches):
+        batches_completed.append((batch_num, total_batches))
+
+    fetch_taxa_batch(list(range(40)), batch_size=30, callback=callback)
+
+    # Callback should have been called twice
+    assert batches_completed == [(1, 2), (2, 2)]
+
+
+def test_fetch_taxa_batch_preserves_order(monkeypatch):
+    """Test results keep request order even when batches finish out of order."""
+    def slow_first_batch(batch):
+        if batch[0] == 0:
+            # Make the first batch finish last
+            time.sleep(0.05)
+        return echo_batch(batch)
+
+    replace_with_retry(monkeypatch, slow_first_batch)
+
+    result = fetch_taxa_batch(list(range(90)), batch_size=30)
+
+    assert [taxon['id'] for taxon in result] == list(range(90))
+
+
+def test_fetch_taxa_batch_caps_batch_size(monkeypatch):
+    """Test batch_size above the API's per-request limit is clamped to 30."""
+    calls = replace_with_retry(monkeypatch, echo_batch)
+
+    result = fetch_taxa_batch(list(range(100)), batch_size=100)
+
+    assert len(result) == 100
+    assert len(calls) == 4
+    assert max(len(batch) for batch in calls) == 30
+
+
+def test_fetch_taxa_batch_deduplicates_ids(monkeypatch):
+    """Test repeated IDs are requested once, in first-seen order."""
+    calls = replace_with_retry(monkeypatch, echo_batch)
+
+    result = fetch_taxa_batch([3, 1, 3, 2, 1] * 10)
+
+    assert calls == [[3, 1, 2]]
+    assert [taxon['id'] for taxon in result] == [3, 1, 2]
+
 
-        batches_completed = []
+def test_fetch_taxa_batch_stops_after_failure(monkeypatch):
+    """Test a failed batch cancels the batches not yet started."""
+    def fail_first_batch(batch):
+        if batch[0] == 0:
+            raise RuntimeError("API down")
+        return echo_batch(batch)
 
-        def callback(batch_num, total_batches):
-            batches_completed.append((batch_num, total_batches))
+    calls = replace_with_retry(monkeypatch, fail_first_batch)
 
-        result = fetch_taxa_batch(list(range(40)), batch_size=30, callback=callback)
+    with pytest.raises(RuntimeError, match="API down"):
+        fetch_taxa_batch(list(range(40 * 30)), max_workers=1)
 
-        # Callback should have been called twice
-        assert batches_completed == [(1, 2), (2, 2)]
+    assert len(calls) < 40
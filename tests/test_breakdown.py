@@ -1,17 +1,19 @@
 """Tests for breakdown query generation."""
-import sqlite3
 import pytest
 from taxa.breakdown import find_taxon_rank, generate_breakdown_query, find_first_populated_rank
+from tests.helpers import fast_connect
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def test_db():
-    """Create in-memory test database with sample taxa."""
-    conn = sqlite3.connect(':memory:')
-    cursor = conn.cursor()
+    """Create in-memory test database with sample taxa.
+
+    Module-scoped: built once and shared by the read-only tests below.
+    """
+    conn = fast_connect()
 
     # Create simplified taxa table
-    cursor.execute("""
+    conn.execute("""
         CREATE TABLE taxa (
             id INTEGER PRIMARY KEY,
             scientific_name TEXT,
@@ -23,31 +25,32 @@ def test_db():
         )
     """)
 
+    # Index the rank columns as create_schema does, so find_taxon_rank's
+    # probes are index lookups here too
+    for rank in ('family', 'subfamily', 'tribe', 'genus', 'species'):
+        conn.execute(f"CREATE INDEX idx_taxa_{rank} ON taxa({rank})")
+
     # Insert test data
-    cursor.execute("""
-        INSERT INTO taxa (id, scientific_name, family, subfamily, tribe, genus, species)
-        VALUES (1, 'Asteraceae family', 'Asteraceae', NULL, NULL, NULL, NULL)
-    """)
-    cursor.execute("""
-        INSERT INTO taxa (id, scientific_name, family, subfamily, genus, species)
-        VALUES (2, 'Taraxacum officinale', 'Asteraceae', 'Cichorioideae', 'Taraxacum', 'officinale')
-    """)
+    with conn:
+        conn.executemany("""
+            INSERT INTO taxa (id, scientific_name, family, subfamily, tribe, genus, species)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        """, [
+            (1, 'Asteraceae family', 'Asteraceae', None, None, None, None),
+            (2, 'Taraxacum officinale', 'Asteraceae', 'Cichorioideae', None, 'Taraxacum', 'officinale'),
+        ])
 
-    conn.commit()
     yield conn
     conn.close()
 
 
-def test_find_taxon_rank_family(test_db):
-    """Test finding taxon at family rank."""
-    rank = find_taxon_rank(test_db, 'Asteraceae')
-    assert rank == 'family'
-
-
-def test_find_taxon_rank_genus(test_db):
-    """Test finding taxon at genus rank."""
-    rank = find_taxon_rank(test_db, 'Taraxacum')
-    assert rank == 'genus'
+@pytest.mark.parametrize("name,expected", [
+    ('Asteraceae', 'family'),
+    ('Taraxacum', 'genus'),
+])
+def test_find_taxon_rank(test_db, name, expected):
+    """Test finding the rank a taxon name appears at."""
+    assert find_taxon_rank(test_db, name) == expected
 
 
 def test_find_taxon_rank_not_found(test_db):
@@ -56,6 +59,17 @@ def test_find_taxon_rank_not_found(test_db):
         find_taxon_rank(test_db, 'NotARealTaxon')
 
 
+def test_find_taxon_rank_full_schema_skips_introspection(memory_sample_db):
+    """With every rank column present, the lookup is a single query."""
+    statements = []
+    memory_sample_db.set_trace_callback(statements.append)
+
+    assert find_taxon_rank(memory_sample_db, 'Rosaceae') == 'family'
+
+    assert len(statements) == 1
+    assert 'PRAGMA' not in statements[0]
+
+
 def test_generate_breakdown_query_single_level():
     """Test generating query for single level breakdown."""
     from taxa.breakdown import generate_breakdown_query
@@ -76,7 +90,7 @@ def test_generate_breakdown_query_single_level():
     assert 'family = ?' in query
 
     # Should aggregate observation and species counts
-    assert 'SUM(observations.observation_count)' in query
+    assert 'SUM(observation_count)' in query
     assert 'COUNT(DISTINCT' in query
     assert 'species' in query.lower()
 
@@ -100,8 +114,10 @@ def test_generate_breakdown_query_multiple_levels():
     # Should have UNION ALL for multiple queries
     assert 'UNION ALL' in query
 
-    # Should have 2 SELECTs (one for subfamily, one for subfamily+tribe)
-    assert query.count('SELECT') == 2
+    # Should have the shared join plus 2 SELECTs over it
+    # (one for subfamily, one for subfamily+tribe)
+    assert 'WITH base AS' in query
+    assert query.count('SELECT') == 3
 
     # First query groups by subfamily only
     # Second query groups by subfamily and tribe
@@ -111,8 +127,12 @@ def test_generate_breakdown_query_multiple_levels():
     # Should have NULL as tribe in first query
     assert 'NULL as tribe' in query
 
-    # Params should have base taxon twice (once per query)
-    assert params == ['Asteraceae', 'Asteraceae']
+    # The first level's NOT NULL filter is applied once, in the shared join
+    assert query.count('subfamily IS NOT NULL') == 1
+    assert query.count('tribe IS NOT NULL') == 1
+
+    # Params should have base taxon once (filter lives in the shared join)
+    assert params == ['Asteraceae']
 
 
 def test_generate_breakdown_query_with_region():
@@ -148,6 +168,18 @@ def test_generate_breakdown_query_skip_levels():
     assert params == ['Asteraceae']
 
 
+def test_generate_breakdown_query_reuses_sql_per_shape():
+    """Queries with the same shape share one SQL string; only params differ."""
+    from taxa.breakdown import generate_breakdown_query
+
+    query_a, params_a = generate_breakdown_query('Asteraceae', 'family', ['tribe', 'subfamily'])
+    query_b, params_b = generate_breakdown_query('Rosaceae', 'family', ['subfamily', 'tribe'])
+
+    assert query_a is query_b
+    assert params_a == ['Asteraceae']
+    assert params_b == ['Rosaceae']
+
+
 def test_find_first_populated_rank_next_rank_populated(memory_sample_db):
     """When next rank has data, return it without skipping."""
     conn = memory_sample_db
@@ -173,18 +205,17 @@ def test_find_first_populated_rank_skip_one_rank(memory_sample_db):
 def test_find_first_populated_rank_skip_multiple_ranks(memory_sample_db):
     """When multiple ranks are NULL, skip to the first populated rank."""
     conn = memory_sample_db
-    cursor = conn.cursor()
 
-    # Create a taxon with NULL tribe and subtribe, but populated genus
-    cursor.execute("""
-        INSERT INTO taxa (id, scientific_name, rank, family, subfamily, tribe, subtribe, genus)
-        VALUES (999, 'Test genus', 'genus', 'Rosaceae', 'Testinae', NULL, NULL, 'Testus')
-    """)
-    cursor.execute("""
-        INSERT INTO observations (taxon_id, region_key, place_id, observation_count)
-        VALUES (999, 'test_region', 1, 50)
-    """)
-    conn.commit()
+    with conn:
+        # Create a taxon with NULL tribe and subtribe, but populated genus
+        conn.execute("""
+            INSERT INTO taxa (id, scientific_name, rank, family, subfamily, tribe, subtribe, genus)
+            VALUES (999, 'Test genus', 'genus', 'Rosaceae', 'Testinae', NULL, NULL, 'Testus')
+        """)
+        conn.execute("""
+            INSERT INTO observations (taxon_id, region_key, place_id, observation_count)
+            VALUES (999, 'test_region', 1, 50)
+        """)
 
     populated, expected = find_first_populated_rank(conn, "Testinae", "subfamily")
 
@@ -195,18 +226,17 @@ def test_find_first_populated_rank_skip_multiple_ranks(memory_sample_db):
 def test_find_first_populated_rank_no_populated_ranks(memory_sample_db):
     """When no ranks below base are populated, raise ValueError."""
     conn = memory_sample_db
-    cursor = conn.cursor()
 
-    # Create a species with no lower ranks populated
-    cursor.execute("""
-        INSERT INTO taxa (id, scientific_name, rank, family, genus, species, subspecies, variety)
-        VALUES (998, 'Test species', 'species', 'Rosaceae', 'Testus', 'testus', NULL, NULL)
-    """)
-    cursor.execute("""
-        INSERT INTO observations (taxon_id, region_key, place_id, observation_count)
-        VALUES (998, 'test_region', 1, 30)
-    """)
-    conn.commit()
+    with conn:
+        # Create a species with no lower ranks populated
+        conn.execute("""
+            INSERT INTO taxa (id, scientific_name, rank, family, genus, species, subspecies, variety)
+            VALUES (998, 'Test species', 'species', 'Rosaceae', 'Testus', 'testus', NULL, NULL)
+        """)
+        conn.execute("""
+            INSERT INTO observations (taxon_id, region_key, place_id, observation_count)
+            VALUES (998, 'test_region', 1, 30)
+        """)
 
     with pytest.raises(ValueError, match="No populated levels below 'species' in taxonomy"):
         find_first_populated_rank(conn, "testus", "species")
@@ -219,3 +249,12 @@ def test_find_first_populated_rank_at_lowest_rank(memory_sample_db):
     # 'form' is the lowest rank
     with pytest.raises(ValueError, match="No levels below 'form' in taxonomy"):
         find_first_populated_rank(conn, "some_form", "form")
+
+
+def test_find_first_populated_rank_single_query(memory_sample_db):
+    """Skipping several empty ranks still takes one query."""
+    statements = []
+    memory_sample_db.set_trace_callback(statements.append)
+
+    assert find_first_populated_rank(memory_sample_db, "Dryadoideae", "subfamily") == ("genus", "tribe")
+    assert len(statements) == 1
@@ -1,54 +1,40 @@
 """Integration tests for breakdown command with realistic database."""
-import sqlite3
 import pytest
-from pathlib import Path
-from taxa.schema import create_schema
 from taxa.breakdown import find_taxon_rank, generate_breakdown_query
+from tests.helpers import schema_connect
 
 
-@pytest.fixture
-def populated_db(tmp_path):
-    """Create test database with realistic taxonomic data."""
-    db_path = tmp_path / "test.db"
-    conn = sqlite3.connect(db_path)
-    create_schema(conn)
+@pytest.fixture(scope="module")
+def populated_db():
+    """Create test database with realistic taxonomic data.
 
-    cursor = conn.cursor()
-
-    # Insert family-level taxa
-    cursor.execute("""
-        INSERT INTO taxa (id, scientific_name, rank, family)
-        VALUES (1, 'Asteraceae', 'family', 'Asteraceae')
-    """)
-
-    # Insert subfamily-level taxa
-    cursor.execute("""
-        INSERT INTO taxa (id, scientific_name, rank, family, subfamily)
-        VALUES (2, 'Asteroideae sp.', 'species', 'Asteraceae', 'Asteroideae')
-    """)
-    cursor.execute("""
-        INSERT INTO taxa (id, scientific_name, rank, family, subfamily)
-        VALUES (3, 'Cichorioideae sp.', 'species', 'Asteraceae', 'Cichorioideae')
-    """)
-
-    # Insert tribe-level taxa
-    cursor.execute("""
-        INSERT INTO taxa (id, scientific_name, rank, family, subfamily, tribe)
-        VALUES (4, 'Anthemideae sp.', 'species', 'Asteraceae', 'Asteroideae', 'Anthemideae')
-    """)
-    cursor.execute("""
-        INSERT INTO taxa (id, scientific_name, rank, family, subfamily, tribe)
-        VALUES (5, 'Astereae sp.', 'species', 'Asteraceae', 'Asteroideae', 'Astereae')
-    """)
-
-    # Insert observations
-    for taxon_id in [2, 3, 4, 5]:
-        cursor.execute("""
+    Module-scoped: built once and shared by the read-only tests below.
+    """
+    conn = schema_connect()
+
+    taxa_rows = [
+        # Family
+        (1, 'Asteraceae', 'family', 'Asteraceae', None, None),
+        # Subfamilies
+        (2, 'Asteroideae sp.', 'species', 'Asteraceae', 'Asteroideae', None),
+        (3, 'Cichorioideae sp.', 'species', 'Asteraceae', 'Cichorioideae', None),
+        # Tribes
+        (4, 'Anthemideae sp.', 'species', 'Asteraceae', 'Asteroideae', 'Anthemideae'),
+        (5, 'Astereae sp.', 'species', 'Asteraceae', 'Asteroideae', 'Astereae'),
+    ]
+    obs_rows = [(taxon_id, 'test_region', 1, taxon_id * 100) for taxon_id in [2, 3, 4, 5]]
+
+    # One transaction for all rows
+    with conn:
+        conn.executemany("""
+            INSERT INTO taxa (id, scientific_name, rank, family, subfamily, tribe)
+            VALUES (?, ?, ?, ?, ?, ?)
+        """, taxa_rows)
+        conn.executemany("""
             INSERT INTO observations (taxon_id, region_key, place_id, observation_count)
-            VALUES (?, 'test_region', 1, ?)
-        """, (taxon_id, taxon_id * 100))
+            VALUES (?, ?, ?, ?)
+        """, obs_rows)
 
-    conn.commit()
     yield conn
     conn.close()
 
@@ -115,6 +101,22 @@ def test_breakdown_with_region_filter_integration(populated_db):
     assert len(results) > 0
 
 
+def test_find_taxon_rank_uses_rank_indexes(populated_db):
+    """Test that each rank probe is an index lookup, not a table scan."""
+    statements = []
+    populated_db.set_trace_callback(statements.append)
+    try:
+        assert find_taxon_rank(populated_db, 'Asteraceae') == 'family'
+    finally:
+        populated_db.set_trace_callback(None)
+
+    # The traced statement has the name already bound in
+    plan = populated_db.execute("EXPLAIN QUERY PLAN " + statements[0]).fetchall()
+    details = [row[-1] for row in plan]
+    assert not any(detail.startswith('SCAN taxa') for detail in details)
+    assert 'SEARCH taxa USING COVERING INDEX idx_taxa_family (family=?)' in details
+
+
 def test_breakdown_with_all_null_values_at_level():
     """Test single-level breakdown when all taxa have NULL at requested level.
 
@@ -122,32 +124,24 @@ def test_breakdown_with_all_null_values_at_level():
     at the breakdown level, should return one row with NULL value showing
     total observations, not zero rows.
     """
-    db_path = Path(':memory:')
-    conn = sqlite3.connect(str(db_path))
-    create_schema(conn)
+    conn = schema_connect()
     cursor = conn.cursor()
 
-    # Create subfamily with no tribe values (like Dryadoideae)
-    cursor.execute("""
-        INSERT INTO taxa (id, scientific_name, rank, family, subfamily, genus)
-        VALUES (1, 'Cercocarpus', 'genus', 'Rosaceae', 'Dryadoideae', 'Cercocarpus')
-    """)
-    cursor.execute("""
-        INSERT INTO taxa (id, scientific_name, rank, family, subfamily, genus)
-        VALUES (2, 'Cercocarpus betuloides', 'species', 'Rosaceae', 'Dryadoideae', 'Cercocarpus')
-    """)
-
-    # Add observations
-    cursor.execute("""
-        INSERT INTO observations (taxon_id, region_key, place_id, observation_count)
-        VALUES (1, 'test', 1, 400)
-    """)
-    cursor.execute("""
-        INSERT INTO observations (taxon_id, region_key, place_id, observation_count)
-        VALUES (2, 'test', 1, 193)
-    """)
-
-    conn.commit()
+    with conn:
+        # Create subfamily with no tribe values (like Dryadoideae)
+        conn.executemany("""
+            INSERT INTO taxa (id, scientific_name, rank, family, subfamily, genus)
+            VALUES (?, ?, ?, ?, ?, ?)
+        """, [
+            (1, 'Cercocarpus', 'genus', 'Rosaceae', 'Dryadoideae', 'Cercocarpus'),
+            (2, 'Cercocarpus betuloides', 'species', 'Rosaceae', 'Dryadoideae', 'Cercocarpus'),
+        ])
+
+        # Add observations
+        conn.executemany("""
+            INSERT INTO observations (taxon_id, region_key, place_id, observation_count)
+            VALUES (?, ?, ?, ?)
+        """, [(1, 'test', 1, 400), (2, 'test', 1, 193)])
 
     # Break down by tribe (all NULL)
     query, params = generate_breakdown_query(
@@ -153,7 +153,7 @@ def test_search_places_command():
     """Test search places command."""
     runner = CliRunner()
 
-    with patch('taxa.cli.get_places_autocomplete') as mock_places:
+    with patch('pyinaturalist.get_places_autocomplete') as mock_places:
         mock_places.return_value = {
             'results': [
                 {'id': 123, 'display_name': 'Test Place, CA, US'},
@@ -173,7 +173,7 @@ def test_search_taxa_command():
     """Test search taxa command."""
     runner = CliRunner()
 
-    with patch('taxa.cli.get_taxa_autocomplete') as mock_taxa:
+    with patch('pyinaturalist.get_taxa_autocomplete') as mock_taxa:
         mock_taxa.return_value = {
             'results': [
                 {
@@ -194,6 +194,42 @@ def test_search_taxa_command():
     assert 'rose family' in result.output
 
 
+def test_search_places_multiple_queries():
+    """Test search places with several queries, deduplicating repeats."""
+    runner = CliRunner()
+
+    def fake_autocomplete(q, per_page, session=None):
+        return {'results': [{'id': len(q), 'display_name': f'{q} County'}]}
+
+    with patch('pyinaturalist.get_places_autocomplete', side_effect=fake_autocomplete) as mock_places:
+        result = runner.invoke(main, ['search', 'places', 'Marin', 'Sonoma', ' marin'])
+
+    assert result.exit_code == 0
+    assert mock_places.call_count == 2
+    sessions = {call.kwargs['session'] for call in mock_places.call_args_list}
+    assert len(sessions) == 1
+    assert "Places matching 'Marin':" in result.output
+    assert "Places matching 'Sonoma':" in result.output
+    assert result.output.index('Marin County') < result.output.index('Sonoma County')
+
+
+def test_cli_import_skips_pyinaturalist():
+    """Test importing the CLI does not import pyinaturalist."""
+    import subprocess
+    import sys
+
+    code = "import sys, taxa.cli; print('pyinaturalist' in sys.modules)"
+    result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == 'False'
+
+
+def test_search_taxa_requires_query():
+    """Test search taxa without any query is a usage error."""
+    runner = CliRunner()
+    result = runner.invoke(main, ['search', 'taxa'])
+    assert result.exit_code == 2
+
+
 def test_info_command():
     """Test info command."""
     runner = CliRunner()
@@ -545,3 +581,121 @@ def test_query_command_with_show_null_option(mocker):
     mock_output.assert_called_once()
     call_kwargs = mock_output.call_args[1]
     assert call_kwargs['show_null'] is True
+
+
+def test_info_command_uses_cached_counts():
+    """info reports counts cached in sync_info instead of recounting."""
+    runner = CliRunner()
+    with runner.isolated_filesystem():
+        import sqlite3
+        from taxa.schema import create_schema
+
+        conn = sqlite3.connect('flora.db')
+        create_schema(conn)
+        conn.executemany("INSERT INTO sync_info (key, value) VALUES (?, ?)", [
+            ('taxa_count', '1234'),
+            ('region_count', '3'),
+            ('obs_rows', '2000'),
+            ('total_observation_count', '56789'),
+        ])
+        conn.commit()
+        conn.close()
+
+        result = runner.invoke(main, ['info'])
+
+        assert result.exit_code == 0
+        assert 'Last sync: Never' in result.output
+        assert 'Taxa: 1,234' in result.output
+        assert 'Total observations: 56,789' in result.output
+
+
+def test_info_command_refresh_recounts():
+    """info --refresh recounts the tables and updates the cache."""
+    runner = CliRunner()
+    with runner.isolated_filesystem():
+        import sqlite3
+        from taxa.schema import create_schema
+
+        conn = sqlite3.connect('flora.db')
+        create_schema(conn)
+        conn.executemany("INSERT INTO sync_info (key, value) VALUES (?, ?)", [
+            ('taxa_count', '1234'),
+            ('region_count', '3'),
+            ('obs_rows', '2000'),
+            ('total_observation_count', '56789'),
+        ])
+        conn.execute("INSERT INTO taxa (id, scientific_name, rank) VALUES (1, 'Test', 'species')")
+        conn.commit()
+        conn.close()
+
+        result = runner.invoke(main, ['info', '--refresh'])
+
+        assert result.exit_code == 0
+        assert 'Taxa: 1' in result.output
+        assert 'Taxa: 1,234' not in result.output
+
+        conn = sqlite3.connect('flora.db')
+        value = conn.execute("SELECT value FROM sync_info WHERE key = 'taxa_count'").fetchone()[0]
+        conn.close()
+        assert value == '1'
+
+
+def test_query_command_with_limit_and_offset():
+    """Test query --limit/--offset returns only the requested page."""
+    runner = CliRunner()
+    with runner.isolated_filesystem():
+        import sqlite3
+        conn = sqlite3.connect('flora.db')
+        conn.execute('CREATE TABLE test (id INTEGER)')
+        conn.executemany('INSERT INTO test VALUES (?)', [(i,) for i in range(10)])
+        conn.commit()
+        conn.close()
+
+        result = runner.invoke(main, [
+            'query', 'SELECT id FROM test ORDER BY id -- ascending', '--limit', '3', '--offset', '2'
+        ])
+
+        assert result.exit_code == 0
+        assert result.output.strip().split('\n') == ['id', '2', '3', '4']
+
+
+def test_query_command_limit_rejects_non_select():
+    """Test query --limit refuses to wrap statements that are not SELECTs."""
+    runner = CliRunner()
+    with runner.isolated_filesystem():
+        import sqlite3
+        conn = sqlite3.connect('flora.db')
+        conn.execute('CREATE TABLE test (id INTEGER)')
+        conn.commit()
+        conn.close()
+
+        result = runner.invoke(main, ['query', 'DELETE FROM test', '--limit', '1'])
+
+        assert result.exit_code == 1
+        assert 'only apply to SELECT' in result.output
+
+
+def test_breakdown_command_with_limit(sample_db, cli_runner):
+    """Breakdown --limit caps the number of rows shown."""
+    result = cli_runner.invoke(
+        main,
+        ['breakdown', 'Rosaceae', '--levels', 'subfamily,tribe', '--limit', '1',
+         '--format', 'csv', '--database', sample_db]
+    )
+
+    assert result.exit_code == 0
+    lines = result.stdout.strip().split('\n')
+    assert len(lines) == 2  # header + one row
+
+
+def test_breakdown_command_offset_past_last_row(sample_db, cli_runner):
+    """Breakdown --offset past the last row reports an empty page, not missing observations."""
+    result = cli_runner.invoke(
+        main,
+        ['breakdown', 'Rosaceae', '--levels', 'subfamily', '--offset', '100',
+         '--database', sample_db]
+    )
+
+    assert result.exit_code == 0
+    assert 'No rows in the requested page for Rosaceae' in result.output
+    assert 'No observations found' not in result.output
@@ -1,5 +1,6 @@
 """Tests for completion cache generation."""
 import json
+import os
 import sqlite3
 from pathlib import Path
 import pytest
@@ -185,3 +186,39 @@ def test_generate_cache_empty_database(tmp_path):
     assert cache["region_keys"] == []
     assert cache["metadata"]["taxa_count"] == 0
     assert cache["metadata"]["region_count"] == 0
+
+
+def test_get_cache_path_follows_environment_changes(tmp_path, monkeypatch):
+    """Memoized cache paths still track XDG_CACHE_HOME changes."""
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "a"))
+    first = get_cache_path("flora.db")
+
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "b"))
+    second = get_cache_path("flora.db")
+
+    assert first == tmp_path / "a" / "taxa" / "completion-cache-flora.json"
+    assert second == tmp_path / "b" / "taxa" / "completion-cache-flora.json"
+
+
+def test_write_cache_leaves_no_temp_files(tmp_path):
+    """Writing the cache leaves only the cache file behind."""
+    cache_path = tmp_path / "taxa" / "completion-cache-flora.json"
+
+    write_completion_cache({"taxon_names": ["Rosa"]}, cache_path)
+    write_completion_cache({"taxon_names": ["Rosa", "Rubus"]}, cache_path)
+
+    assert list(cache_path.parent.iterdir()) == [cache_path]
+    assert json.loads(cache_path.read_text()) == {"taxon_names": ["Rosa", "Rubus"]}
+
+
+def test_write_cache_respects_umask(tmp_path):
+    """The cache file gets the usual umask-derived mode, not mkstemp's 0600."""
+    cache_path = tmp_path / "cache.json"
+
+    old_umask = os.umask(0o022)
+    try:
+        write_completion_cache({"taxon_names": ["Rosa"]}, cache_path)
+    finally:
+        os.umask(old_umask)
+
+    assert cache_path.stat().st_mode & 0o777 == 0o644
@@ -0,0 +1,49 @@
+"""Tests for database connection helper."""
+import sqlite3
+import pytest
+from taxa.db import connect
+
+
+def test_connect_applies_pragmas(tmp_path):
+    """Connections get an in-memory temp store and a larger page cache."""
+    conn = connect(tmp_path / 'test.db')
+
+    assert conn.execute("PRAGMA temp_store").fetchone()[0] == 2  # MEMORY
+    assert conn.execute("PRAGMA cache_size").fetchone()[0] == -65536
+
+    conn.close()
+
+
+def test_connect_does_not_change_journal_mode(tmp_path):
+    """Connecting leaves the database file's journal mode alone."""
+    conn = connect(tmp_path / 'test.db')
+
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == 'delete'
+
+    conn.close()
+
+
+def test_connect_readonly_rejects_writes(tmp_path):
+    """Read-only connections can query but not modify the database."""
+    db_path = tmp_path / 'test.db'
+    conn = sqlite3.connect(db_path)
+    conn.execute("CREATE TABLE test (id INTEGER)")
+    conn.execute("INSERT INTO test VALUES (1)")
+    conn.commit()
+    conn.close()
+
+    conn = connect(db_path, readonly=True)
+
+    assert conn.execute("SELECT id FROM test").fetchone()[0] == 1
+    with pytest.raises(sqlite3.OperationalError, match="readonly"):
+        conn.execute("INSERT INTO test VALUES (2)")
+
+    conn.close()
+
+
+def test_connect_readonly_missing_database(tmp_path):
+    """Read-only connections do not create missing databases."""
+    with pytest.raises(sqlite3.OperationalError):
+        connect(tmp_path / 'missing.db', readonly=True)
+
+    assert not (tmp_path / 'missing.db').exists()
@@ -2,7 +2,7 @@
 import sys
 import io
 from unittest.mock import Mock
-from taxa.formatting import detect_format, transform_null, format_csv, format_table, output_results
+from taxa.formatting import detect_format, transform_null, make_row_transformer, format_csv, format_table, output_results
 
 
 def test_detect_format_returns_table_for_tty(mocker):
@@ -39,6 +39,13 @@ def test_transform_null_preserves_values_with_show_null():
     assert transform_null('foo', show_null=True) == 'foo'
 
 
+def test_make_row_transformer():
+    """Row transformer renders None per show_null and keeps other values."""
+    assert make_row_transformer()((1, None, 'a')) == [1, '', 'a']
+    assert make_row_transformer(show_null=True)((1, None, 'a')) == [1, 'NULL', 'a']
+    assert make_row_transformer(stringify=True)((1, None, 'a')) == ['1', '', 'a']
+
+
 def test_format_csv_basic_output(capsys):
     """CSV formatter outputs RFC 4180 compliant CSV."""
     headers = ['name', 'count']
@@ -83,6 +90,17 @@ def test_format_csv_escapes_values_with_commas(capsys):
     assert captured.out == 'name,description\nAlice,"Hello, world"\n'
 
 
+def test_format_csv_streams_from_iterator(capsys):
+    """CSV formatter consumes rows lazily, e.g. straight from a cursor."""
+    headers = ['name', 'count']
+    rows = iter([('Alice', 10), ('Bob', None)])
+
+    format_csv(headers, rows, show_null=False)
+
+    captured = capsys.readouterr()
+    assert captured.out == 'name,count\nAlice,10\nBob,\n'
+
+
 def test_format_table_creates_table_with_headers(mocker):
     """Table formatter creates table with correct headers."""
     mock_console = Mock()
@@ -0,0 +1,74 @@
+import threading
+import pytest
+from taxa.limiter import AIMDLimiter
+
+
+def test_limiter_increases_additively_on_success():
+    limiter = AIMDLimiter(initial=1, c_max=4, alpha=0.5)
+
+    for _ in range(4):
+        limiter.acquire()
+        limiter.release(True, 0.1)
+
+    assert limiter.c == 3.0
+    assert limiter.limit == 3
+
+
+def test_limiter_caps_at_c_max():
+    limiter = AIMDLimiter(initial=1, c_max=2, alpha=1)
+
+    for _ in range(5):
+        limiter.acquire()
+        limiter.release(True, 0.1)
+
+    assert limiter.limit == 2
+
+
+def test_limiter_decreases_multiplicatively_on_failure():
+    limiter = AIMDLimiter(initial=4, c_max=4, beta=0.5)
+
+    limiter.acquire()
+    limiter.release(False, 0.1)
+    assert limiter.c == 2.0
+
+    limiter.acquire()
+    limiter.release(False, 0.1)
+    limiter.acquire()
+    limiter.release(False, 0.1)
+    assert limiter.c == 1.0
+
+
+def test_limiter_treats_slow_responses_as_failures():
+    limiter = AIMDLimiter(initial=4, c_max=4, target_latency=1.0)
+
+    limiter.acquire()
+    limiter.release(True, 3.0)
+
+    assert limiter.c == 2.0
+
+
+def test_limiter_blocks_beyond_limit():
+    limiter = AIMDLimiter(initial=1, c_max=1)
+    limiter.acquire()
+
+    acquired = threading.Event()
+
+    def second_request():
+        limiter.acquire()
+        acquired.set()
+
+    thread = threading.Thread(target=second_request)
+    thread.start()
+    assert not acquired.wait(0.05)
+
+    limiter.release(True, 0.1)
+    assert acquired.wait(1)
+    thread.join()
+    assert limiter.in_flight == 1
+
+
+def test_limiter_rejects_invalid_bounds():
+    with pytest.raises(ValueError, match="c_min <= initial <= c_max"):
+        AIMDLimiter(initial=8, c_max=4)
+    with pytest.raises(ValueError, match="0 < beta < 1"):
+        AIMDLimiter(beta=1.5)
@@ -10,6 +10,13 @@ def test_metrics_tracker_initialization():
     assert tracker.api_calls == 0
 
 
+def test_metrics_tracker_uses_slots():
+    tracker = MetricsTracker(total_items=100)
+    assert not hasattr(tracker, '__dict__')
+    with pytest.raises(AttributeError):
+        tracker.procesed = 5
+
+
 def test_metrics_tracker_increments():
     tracker = MetricsTracker(total_items=100)
     tracker.increment_processed(5)
@@ -31,7 +38,7 @@ def test_increment_api_calls_rejects_negative():
         tracker.increment_api_calls(-5)
 
 
-@patch("taxa.metrics.time.time")
+@patch("taxa.metrics.time.monotonic")
 def test_metrics_tracker_calculates_rate(mock_time):
     mock_time.side_effect = [0.0, 1.0]  # start_time=0, elapsed=1
     tracker = MetricsTracker(total_items=100)
@@ -41,7 +48,7 @@ def test_metrics_tracker_calculates_rate(mock_time):
     assert rate == 10.0
 
 
-@patch("taxa.metrics.time.time")
+@patch("taxa.metrics.time.monotonic")
 def test_metrics_tracker_rate_zero_elapsed_time(mock_time):
     mock_time.return_value = 0.0
     tracker = MetricsTracker(total_items=100)
@@ -51,7 +58,7 @@ def test_metrics_tracker_rate_zero_elapsed_time(mock_time):
     assert rate == 0.0
 
 
-@patch("taxa.metrics.time.time")
+@patch("taxa.metrics.time.monotonic")
 def test_estimate_completion_time_when_complete(mock_time):
     mock_time.side_effect = [0.0, 1.0]
     tracker = MetricsTracker(total_items=100)
@@ -61,7 +68,7 @@ def test_estimate_completion_time_when_complete(mock_time):
     assert estimate == 0.0
 
 
-@patch("taxa.metrics.time.time")
+@patch("taxa.metrics.time.monotonic")
 def test_estimate_completion_time_with_progress(mock_time):
     mock_time.side_effect = [0.0, 1.0]
     tracker = MetricsTracker(total_items=100)
@@ -90,9 +97,9 @@ def test_get_progress_percent_full_progress():
     assert tracker.get_progress_percent() == 100.0
 
 
-@patch("taxa.metrics.time.time")
+@patch("taxa.metrics.time.monotonic")
 def test_format_report_structure(mock_time):
-    mock_time.side_effect = [0.0, 1.0, 1.0, 1.0]
+    mock_time.side_effect = [0.0, 1.0]  # one clock read per report
     tracker = MetricsTracker(total_items=100)
     tracker.increment_processed(50)
     tracker.increment_api_calls(10)
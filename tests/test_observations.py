@@ -40,11 +40,13 @@ def test_fetch_observation_summary():
 
 def test_fetch_observation_summary_no_results():
     """Test handling when API returns no results."""
-    with patch('taxa.observations.get_observation_species_counts') as mock_counts:
+    with patch('taxa.observations.get_observation_species_counts') as mock_counts, \
+         patch('taxa.observations.get_observation_histogram') as mock_hist:
         mock_counts.return_value = {'results': []}
 
         result = fetch_observation_summary(47125, 14, 'research')
         assert result is None
+        mock_hist.assert_not_called()
 
 
 def test_fetch_observation_summary_histogram_parsing():
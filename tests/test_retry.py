@@ -1,7 +1,7 @@
 import pytest
 import time
 from unittest.mock import Mock, patch
-from taxa.retry import with_retry, RateLimitError
+from taxa.retry import with_retry, retry_after_seconds, RateLimitError
 
 
 def test_with_retry_succeeds_on_first_attempt():
@@ -27,10 +27,11 @@ def test_with_retry_handles_network_errors():
 
     assert result == {"data": "success"}
     assert mock_func.call_count == 3
-    # Should have slept with exponential backoff: 1s, 2s
+    # Should have slept with jittered exponential backoff: 0.5-1s, 1-2s
     assert mock_sleep.call_count == 2
-    mock_sleep.assert_any_call(1)
-    mock_sleep.assert_any_call(2)
+    first, second = (call.args[0] for call in mock_sleep.call_args_list)
+    assert 0.5 <= first <= 1
+    assert 1 <= second <= 2
 
 
 def test_with_retry_handles_429_rate_limit():
@@ -47,7 +48,8 @@ def test_with_retry_handles_429_rate_limit():
 
     assert result == {"data": "success"}
     assert mock_func.call_count == 2
-    mock_sleep.assert_called_once_with(1)
+    mock_sleep.assert_called_once()
+    assert 0.5 <= mock_sleep.call_args.args[0] <= 1
 
 
 def test_with_retry_gives_up_after_max_attempts():
@@ -73,3 +75,129 @@ def test_with_retry_handles_timeout_errors():
 
     assert result == {"data": "success"}
     assert mock_func.call_count == 2
+
+
+def test_with_retry_jitter_respects_max_delay():
+    """Test that jittered delays never exceed max_delay."""
+    mock_func = Mock(side_effect=ConnectionError("Network error"))
+
+    with patch('time.sleep') as mock_sleep:
+        with pytest.raises(ConnectionError):
+            with_retry(mock_func, max_attempts=6, base_delay=1.0, max_delay=4.0)
+
+    delays = [call.args[0] for call in mock_sleep.call_args_list]
+    assert len(delays) == 5
+    assert all(delay <= 4.0 for delay in delays)
+    assert all(delay >= 2.0 for delay in delays[2:])
+
+
+def http_error(status, headers):
+    """Build an exception carrying a response, like requests' HTTPError."""
+    error = Exception(f"{status} Client Error: Too Many Requests")
+    error.response = Mock(status_code=status, headers=headers)
+    return error
+
+
+def test_with_retry_honors_retry_after():
+    """Test that a Retry-After header overrides a shorter backoff."""
+    mock_func = Mock(side_effect=[
+        http_error(429, {'Retry-After': '7'}),
+        {"data": "success"}
+    ])
+
+    with patch('time.sleep') as mock_sleep:
+        result = with_retry(mock_func)
+
+    assert result == {"data": "success"}
+    mock_sleep.assert_called_once_with(7.0)
+
+
+def test_with_retry_caps_retry_after_at_max_delay():
+    """Test that Retry-After cannot exceed max_delay."""
+    mock_func = Mock(side_effect=[
+        http_error(429, {'Retry-After': '3600'}),
+        {"data": "success"}
+    ])
+
+    with patch('time.sleep') as mock_sleep:
+        with_retry(mock_func, max_delay=30.0)
+
+    mock_sleep.assert_called_once_with(30.0)
+
+
+def test_retry_after_seconds_parses_http_date():
+    """Test Retry-After given as an HTTP date."""
+    with patch('time.time', return_value=782724567.0):
+        delay = retry_after_seconds(http_error(429, {'Retry-After': 'Wed, 21 Oct 1994 07:29:37 GMT'}))
+
+    assert delay == 10.0
+
+
+def test_retry_after_seconds_without_header():
+    """Test errors without a usable Retry-After."""
+    assert retry_after_seconds(ConnectionError("Network error")) is None
+    assert retry_after_seconds(http_error(429, {})) is None
+    assert retry_after_seconds(http_error(429, {'Retry-After': 'soon'})) is None
+
+
+def test_with_retry_reports_to_limiter():
+    """Test that each attempt takes a limiter slot and reports its outcome."""
+    from taxa.limiter import AIMDLimiter
+
+    limiter = AIMDLimiter(initial=2, c_max=2)
+    mock_func = Mock(side_effect=[
+        Exception("429 Client Error: Too Many Requests"),
+        {"data": "success"}
+    ])
+
+    with patch('time.sleep'):
+        result = with_retry(mock_func, limiter=limiter)
+
+    assert result == {"data": "success"}
+    assert "limiter" not in mock_func.call_args.kwargs
+    assert limiter.in_flight == 0
+    # Halved by the 429, then raised by the success
+    assert limiter.c == 1.5
+
+
+def test_with_retry_uses_status_code_over_message():
+    """Test that an HTTP error's status decides, not digits in its message."""
+    mock_func = Mock(side_effect=http_error(404, {}))
+    mock_func.side_effect.args = ("404 Client Error for url: /v1/taxa/429",)
+
+    with patch('time.sleep') as mock_sleep:
+        with pytest.raises(Exception):
+            with_retry(mock_func)
+
+    assert mock_func.call_count == 1
+    mock_sleep.assert_not_called()
+
+
+def test_with_retry_handles_gateway_errors():
+    """Test that 502/503/504 responses are retried."""
+    mock_func = Mock(side_effect=[
+        http_error(503, {}),
+        {"data": "success"}
+    ])
+
+    with patch('time.sleep'):
+        result = with_retry(mock_func)
+
+    assert result == {"data": "success"}
+    assert mock_func.call_count == 2
+
+
+def test_with_retry_handles_requests_connection_errors():
+    """Test that requests' own ConnectionError is retried."""
+    from requests.exceptions import ConnectionError as RequestsConnectionError
+
+    mock_func = Mock(side_effect=[
+        RequestsConnectionError("Connection aborted"),
+        {"data": "success"}
+    ])
+
+    with patch('time.sleep'):
+        result = with_retry(mock_func)
+
+    assert result == {"data": "success"}
+    assert mock_func.call_count == 2
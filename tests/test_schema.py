@@ -1,7 +1,7 @@
 """Tests for schema creation."""
 import sqlite3
 import pytest
-from taxa.schema import create_schema
+from taxa.schema import create_schema, create_indexes
 from taxa.taxonomy import TAXONOMIC_RANKS
 
 
@@ -37,3 +37,37 @@ def test_schema_rank_order_matches_taxonomy():
     assert rank_columns == TAXONOMIC_RANKS
 
     conn.close()
+
+
+def test_schema_indexes_every_rank_column():
+    """Test that each rank column has an index for name lookups."""
+    conn = sqlite3.connect(':memory:')
+    create_schema(conn)
+
+    cursor = conn.cursor()
+    cursor.execute("SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'taxa'")
+    indexes = {row[0] for row in cursor.fetchall()}
+
+    for rank in TAXONOMIC_RANKS:
+        assert f"idx_taxa_{rank}" in indexes, f"Missing index for rank: {rank}"
+
+    # Rank lookups should use the index rather than scanning taxa
+    cursor.execute("EXPLAIN QUERY PLAN SELECT 1 FROM taxa WHERE subtribe = ?", ('Test',))
+    plan = ' '.join(row[3] for row in cursor.fetchall())
+    assert 'idx_taxa_subtribe' in plan
+
+    conn.close()
+
+
+def test_schema_defers_indexes():
+    """Test that indexes=False creates tables only, and create_indexes adds them."""
+    conn = sqlite3.connect(':memory:')
+    create_schema(conn, indexes=False)
+
+    index_sql = "SELECT COUNT(*) FROM sqlite_master WHERE type = 'index' AND name LIKE 'idx_%'"
+    assert conn.execute(index_sql).fetchone()[0] == 0
+
+    create_indexes(conn)
+    assert conn.execute(index_sql).fetchone()[0] == len(TAXONOMIC_RANKS) + 1
+
+    conn.close()
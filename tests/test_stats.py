@@ -0,0 +1,56 @@
+"""Tests for cached database statistics."""
+import pytest
+from taxa.stats import STAT_QUERIES, compute_stats, store_stats, read_sync_info, cached_stats
+from tests.helpers import schema_connect
+
+
+@pytest.fixture
+def stats_db():
+    """Create in-memory database with two taxa observed in two regions."""
+    conn = schema_connect()
+    conn.execute("INSERT INTO taxa (id, scientific_name, rank) VALUES (1, 'Quercus', 'genus')")
+    conn.execute("INSERT INTO taxa (id, scientific_name, rank) VALUES (2, 'Quercus alba', 'species')")
+    conn.execute("""
+        INSERT INTO observations (taxon_id, region_key, place_id, observation_count)
+        VALUES (1, 'us-ca', 1, 100), (2, 'us-ca', 1, 40), (2, 'us-or', 2, 5)
+    """)
+    conn.commit()
+    yield conn
+    conn.close()
+
+
+def test_compute_stats(stats_db):
+    """compute_stats counts rows from the tables."""
+    assert compute_stats(stats_db) == {
+        'taxa_count': 2,
+        'region_count': 2,
+        'obs_rows': 3,
+        'total_observation_count': 145,
+    }
+
+
+def test_region_count_uses_index(stats_db):
+    """Distinct regions are counted from idx_obs_region, not a table scan."""
+    plan = stats_db.execute("EXPLAIN QUERY PLAN " + STAT_QUERIES['region_count']).fetchall()
+    assert any('COVERING INDEX idx_obs_region' in row[-1] for row in plan)
+
+
+def test_compute_stats_empty_database():
+    """Empty observations table yields zero total, not None."""
+    conn = schema_connect()
+
+    assert compute_stats(conn)['total_observation_count'] == 0
+
+    conn.close()
+
+
+def test_stored_stats_round_trip(stats_db):
+    """Stats written to sync_info are read back as integers."""
+    store_stats(stats_db, compute_stats(stats_db))
+
+    assert cached_stats(read_sync_info(stats_db)) == compute_stats(stats_db)
+
+
+def test_cached_stats_missing_keys():
+    """Databases without cached counts return None."""
+    assert cached_stats({'last_sync': '2026-01-01T00:00:00'}) is None
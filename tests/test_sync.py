@@ -3,6 +3,7 @@ import sqlite3
 import pytest
 import json
 import os
+import time
 from pathlib import Path
 from unittest.mock import patch, Mock
 from taxa.sync import sync_database
@@ -63,6 +64,12 @@ def test_sync_database_creates_schema(test_config):
         assert 'regions' in tables
         assert 'sync_info' in tables
 
+        # Indexes are built after the load, but must still exist
+        cursor.execute("SELECT name FROM sqlite_master WHERE type='index'")
+        indexes = {row[0] for row in cursor.fetchall()}
+        assert 'idx_obs_region' in indexes
+        assert 'idx_taxa_genus' in indexes
+
         conn.close()
 
 
@@ -175,6 +182,20 @@ def test_sync_database_stores_observations(test_config):
         conn.close()
 
 
+def test_sync_database_leaves_self_contained_database(test_config):
+    """Test the synced database uses a rollback journal and has no WAL files."""
+    with patch('taxa.sync.fetch_regional_taxa', return_value=[]), \
+         patch('taxa.sync.fetch_taxa_batch', return_value=[]):
+        sync_database(test_config)
+
+    assert not os.path.exists(f"{test_config.database}-wal")
+    assert not os.path.exists(f"{test_config.database}.new-wal")
+
+    conn = sqlite3.connect(test_config.database)
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == 'delete'
+    conn.close()
+
+
 def test_sync_database_stores_sync_metadata(test_config):
     """Test that sync stores sync metadata."""
     with patch('taxa.sync.fetch_regional_taxa', return_value=[]), \
@@ -195,6 +216,41 @@ def test_sync_database_stores_sync_metadata(test_config):
         conn.close()
 
 
+def test_sync_database_stores_cached_counts(test_config):
+    """Test that sync caches the counts shown by `taxa info`."""
+    mock_regional_taxon = {
+        'id': 47851,
+        'name': 'Plantae',
+        'rank': 'kingdom',
+        'descendant_obs_count': 100,
+        'direct_obs_count': 50
+    }
+    mock_batch_taxon = {
+        'id': 47851,
+        'name': 'Plantae',
+        'rank': 'kingdom',
+        'ancestors': []
+    }
+
+    with patch('taxa.sync.fetch_regional_taxa', return_value=[mock_regional_taxon]), \
+         patch('taxa.sync.fetch_taxa_batch', return_value=[mock_batch_taxon]):
+
+        sync_database(test_config)
+
+        conn = sqlite3.connect(test_config.database)
+        cursor = conn.cursor()
+
+        cursor.execute("SELECT key, value FROM sync_info")
+        info = dict(cursor.fetchall())
+
+        assert info['taxa_count'] == '1'
+        assert info['region_count'] == '1'
+        assert info['obs_rows'] == '1'
+        assert info['total_observation_count'] == '100'
+
+        conn.close()
+
+
 def test_sync_database_atomic_replacement(test_config, tmp_path):
     """Test that database replacement is atomic with backup."""
     # Create an existing database
@@ -302,6 +358,85 @@ def test_sync_database_warns_on_missing_taxa(tmp_path, capsys):
         assert 'WARNING: Failed to fetch 1 taxa' in captured.out
         assert '[2]' in captured.out
 
+    # Observations are only written for taxa that have a row
+    conn = sqlite3.connect(config.database)
+    obs_ids = [row[0] for row in conn.execute("SELECT taxon_id FROM observations ORDER BY taxon_id")]
+    conn.close()
+    assert obs_ids == [1, 3]
+
+
+def test_sync_database_flushes_rows_in_batches(test_config):
+    """Test that every row is written when inserts flush in several batches."""
+    regional = [
+        {'id': i, 'descendant_obs_count': i, 'direct_obs_count': i}
+        for i in range(10, 15)
+    ]
+    batch = [
+        {
+            'id': i, 'name': f'Taxon {i}', 'rank': 'species',
+            'ancestors': [{'id': 1, 'name': 'Plantae', 'rank': 'kingdom'}]
+        }
+        for i in range(10, 15)
+    ]
+
+    with patch('taxa.sync.INSERT_BATCH_SIZE', 2), \
+         patch('taxa.sync.fetch_regional_taxa', return_value=regional), \
+         patch('taxa.sync.fetch_taxa_batch', return_value=batch):
+        sync_database(test_config)
+
+    conn = sqlite3.connect(test_config.database)
+    taxa_ids = [row[0] for row in conn.execute("SELECT id FROM taxa ORDER BY id")]
+    obs_count = conn.execute("SELECT COUNT(*) FROM observations").fetchone()[0]
+    conn.close()
+
+    assert taxa_ids == [1, 10, 11, 12, 13, 14]
+    assert obs_count == 5
+
+
+def test_sync_database_flattens_shared_ancestors_once(test_config):
+    """Test that an ancestor shared by several taxa is flattened once."""
+    from taxa.transform import flatten_taxon_ancestry
+
+    plantae = {'id': 1, 'name': 'Plantae', 'rank': 'kingdom'}
+    regional = [{'id': i, 'descendant_obs_count': 1, 'direct_obs_count': 1} for i in (10, 11, 12)]
+    batch = [
+        {'id': i, 'name': f'Taxon {i}', 'rank': 'species', 'ancestors': [plantae]}
+        for i in (10, 11, 12)
+    ]
+
+    with patch('taxa.sync.fetch_regional_taxa', return_value=regional), \
+         patch('taxa.sync.fetch_taxa_batch', return_value=batch), \
+         patch('taxa.sync.flatten_taxon_ancestry', side_effect=flatten_taxon_ancestry) as mock_flatten:
+        sync_database(test_config)
+
+    flattened_ids = [call.args[0]['id'] for call in mock_flatten.call_args_list]
+    assert flattened_ids.count(1) == 1
+
+
+def test_sync_database_skips_ancestors_fetched_in_full(test_config):
+    """Test that a discovered taxon is not re-flattened as another's ancestor."""
+    from taxa.transform import flatten_taxon_ancestry
+
+    genus = {'id': 20, 'name': 'Quercus', 'rank': 'genus'}
+    regional = [{'id': i, 'descendant_obs_count': 1, 'direct_obs_count': 1} for i in (20, 21)]
+    batch = [
+        {'id': 21, 'name': 'Quercus alba', 'rank': 'species', 'ancestors': [genus]},
+        {**genus, 'ancestors': []},
+    ]
+
+    with patch('taxa.sync.fetch_regional_taxa', return_value=regional), \
+         patch('taxa.sync.fetch_taxa_batch', return_value=batch), \
+         patch('taxa.sync.flatten_taxon_ancestry', side_effect=flatten_taxon_ancestry) as mock_flatten:
+        sync_database(test_config)
+
+    flattened_ids = [call.args[0]['id'] for call in mock_flatten.call_args_list]
+    assert flattened_ids.count(20) == 1
+
+    conn = sqlite3.connect(test_config.database)
+    last_fetched = conn.execute("SELECT last_fetched FROM taxa WHERE id = 20").fetchone()[0]
+    conn.close()
+    assert last_fetched is not None
+
 
 def test_sync_database_regional_filtering(tmp_path):
     """Test sync uses regional filtering instead of global fetch."""
@@ -370,3 +505,111 @@ def test_sync_database_regional_filtering(tmp_path):
         cursor.execute("SELECT COUNT(*) FROM taxa")
         assert cursor.fetchone()[0] == 3
         conn.close()
+
+
+def test_sync_database_queries_shared_place_once(tmp_path):
+    """Test that a place listed under several regions is queried once."""
+    config = Config({
+        'database': str(tmp_path / 'test.db'),
+        'regions': {
+            'north': {'name': 'North', 'place_ids': [14, 15]},
+            'south': {'name': 'South', 'place_ids': [14]},
+        },
+        'taxa': {'test_taxon': {'name': 'Test Taxon', 'taxon_id': 47851}},
+        'filters': {}
+    })
+    regional_taxon = {'id': 47851, 'descendant_obs_count': 100, 'direct_obs_count': 50}
+    batch_taxon = {'id': 47851, 'name': 'Plantae', 'rank': 'kingdom', 'ancestors': []}
+
+    with patch('taxa.sync.fetch_regional_taxa', return_value=[regional_taxon]) as mock_regional, \
+         patch('taxa.sync.fetch_taxa_batch', return_value=[batch_taxon]):
+        sync_database(config)
+
+    assert sorted(call.kwargs['place_id'] for call in mock_regional.call_args_list) == [14, 15]
+
+
+def test_sync_database_stops_region_queries_after_failure(tmp_path):
+    """Test that a failed region query cancels the queries not yet started."""
+    config = Config({
+        'database': str(tmp_path / 'test.db'),
+        'regions': {'many': {'name': 'Many', 'place_ids': list(range(1, 41))}},
+        'taxa': {'test_taxon': {'name': 'Test Taxon', 'taxon_id': 47851}},
+        'filters': {}
+    })
+
+    def fetch(taxon_id, place_id, quality_grade=None):
+        if place_id == 1:
+            raise RuntimeError("API down")
+        time.sleep(0.01)
+        return []
+
+    with patch('taxa.sync.fetch_regional_taxa', side_effect=fetch) as mock_regional, \
+         pytest.raises(RuntimeError, match="API down"):
+        sync_database(config)
+
+    assert mock_regional.call_count < 40
+
+
+def test_sync_database_reuses_recently_fetched_taxa(test_config):
+    """Test that a re-sync copies fresh taxa from the previous database."""
+    mock_regional = [
+        {'id': 1, 'descendant_obs_count': 10, 'direct_obs_count': 5},
+        {'id': 2, 'descendant_obs_count': 20, 'direct_obs_count': 20},
+    ]
+    mock_batch = [
+        {'id': 1, 'name': 'Rosa', 'rank': 'genus',
+         'ancestors': [{'id': 100, 'name': 'Rosaceae', 'rank': 'family'}]},
+        {'id': 2, 'name': 'Rosa gymnocarpa', 'rank': 'species',
+         'ancestors': [{'id': 100, 'name': 'Rosaceae', 'rank': 'family'},
+                       {'id': 1, 'name': 'Rosa', 'rank': 'genus'}]},
+    ]
+
+    with patch('taxa.sync.fetch_regional_taxa', return_value=mock_regional), \
+         patch('taxa.sync.fetch_taxa_batch', return_value=mock_batch):
+        sync_database(test_config)
+
+    # Age taxon 2 past the reuse window
+    conn = sqlite3.connect(test_config.database)
+    conn.execute("UPDATE taxa SET last_fetched = 0 WHERE id = 2")
+    conn.commit()
+    conn.close()
+
+    with patch('taxa.sync.fetch_regional_taxa', return_value=mock_regional), \
+         patch('taxa.sync.fetch_taxa_batch', return_value=mock_batch[1:]) as mock_fetch:
+        sync_database(test_config)
+
+    # Only the stale taxon is fetched again
+    assert mock_fetch.call_args[0][0] == [2]
+
+    conn = sqlite3.connect(test_config.database)
+    cursor = conn.cursor()
+
+    cursor.execute("SELECT id, scientific_name, family FROM taxa ORDER BY id")
+    assert cursor.fetchall() == [
+        (1, 'Rosa', 'Rosaceae'),
+        (2, 'Rosa gymnocarpa', 'Rosaceae'),
+        (100, 'Rosaceae', 'Rosaceae'),
+    ]
+
+    cursor.execute("SELECT taxon_id, observation_count FROM observations ORDER BY taxon_id")
+    assert cursor.fetchall() == [(1, 10), (2, 20)]
+
+    conn.close()
+
+
+def test_sync_database_ignores_previous_database_without_fetch_info(test_config):
+    """Test that databases from before fetch bookkeeping are not reused."""
+    old_conn = sqlite3.connect(test_config.database)
+    old_conn.execute("CREATE TABLE taxa (id INTEGER PRIMARY KEY, scientific_name TEXT, rank TEXT)")
+    old_conn.execute("INSERT INTO taxa VALUES (1, 'Old', 'species')")
+    old_conn.commit()
+    old_conn.close()
+
+    mock_regional = [{'id': 1, 'descendant_obs_count': 10, 'direct_obs_count': 5}]
+    mock_batch = [{'id': 1, 'name': 'New', 'rank': 'species', 'ancestors': []}]
+
+    with patch('taxa.sync.fetch_regional_taxa', return_value=mock_regional), \
+         patch('taxa.sync.fetch_taxa_batch', return_value=mock_batch) as mock_fetch:
+        sync_database(test_config)
+
+    assert mock_fetch.call_args[0][0] == [1]
@@ -101,3 +101,18 @@ def test_validate_rank_sequence_mixed_valid_invalid():
 
     with pytest.raises(ValueError, match="not below"):
         validate_rank_sequence('family', ['subfamily', 'kingdom'])
+
+
+def test_unknown_rank_rejected():
+    """Test that every helper rejects ranks outside the hierarchy."""
+    import pytest
+    from taxa.taxonomy import validate_rank_sequence
+
+    with pytest.raises(ValueError, match="Unknown rank: order"):
+        get_next_ranks('order')
+    with pytest.raises(ValueError, match="Unknown rank: clade"):
+        sort_ranks(['genus', 'clade'])
+    with pytest.raises(ValueError, match="Unknown rank: clade"):
+        validate_rank_sequence('clade', ['genus'])
+    with pytest.raises(ValueError, match="Unknown rank: clade"):
+        validate_rank_sequence('family', ['genus', 'clade'])
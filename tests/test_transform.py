@@ -105,3 +105,31 @@ def test_flatten_taxon_ancestry_handles_malformed_ancestors():
     result = flatten_taxon_ancestry(taxon)
     assert result['kingdom'] == 'Plantae'
     assert result['family'] == 'Rosaceae'
+
+
+def test_flatten_taxon_ancestry_ignores_ranks_without_columns():
+    """Test that ranks with no column (e.g. hybrid) don't add keys."""
+    taxon = {
+        'id': 123,
+        'name': 'Test hybrid',
+        'rank': 'hybrid',
+        'ancestors': [
+            {'id': 1, 'name': 'Plantae', 'rank': 'kingdom'},
+            {'id': 2, 'name': 'Some zoosection', 'rank': 'zoosection'},
+        ]
+    }
+
+    result = flatten_taxon_ancestry(taxon)
+    assert result['kingdom'] == 'Plantae'
+    assert 'hybrid' not in result
+    assert 'zoosection' not in result
+    assert result['species'] is None
+
+
+def test_flatten_fills_exactly_ancestor_columns():
+    """Test that flattened rows have a value for each positional insert column."""
+    from taxa.transform import ANCESTOR_COLUMNS
+
+    row = flatten_taxon_ancestry({'id': 1, 'name': 'Plantae', 'rank': 'kingdom'})
+
+    assert set(row) == set(ANCESTOR_COLUMNS)